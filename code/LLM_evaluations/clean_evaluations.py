@@ -1,4 +1,5 @@
 import ast
+import json
 import re
 import pandas as pd
 
@@ -22,68 +23,122 @@ RUBRIC_KEYWORDS = {
 }
 
 
-def add_rubric_columns_keyword_match(df: pd.DataFrame, eval_col: str) -> pd.DataFrame:
+def normalize(text: pd.Series) -> pd.Series:
+    """Lowercase and strip punctuation for robust keyword matching."""
+    return text.str.lower().str.replace(r"[^\w\s]", "", regex=True)
+
+
+# Exact lookup for the common case: the model echoed the rubric name
+EXACT_MATCHES = dict(zip(normalize(pd.Series(list(RUBRIC_KEYWORDS))), RUBRIC_KEYWORDS))
+
+# Keyword fallback, compiled once; the lookahead finds overlapping matches
+KEYWORD_TO_RUBRIC = {k: rubric for rubric, keywords in RUBRIC_KEYWORDS.items() for k in keywords}
+KEYWORD_PATTERN = re.compile(
+    "(?=(" + "|".join(map(re.escape, sorted(KEYWORD_TO_RUBRIC, key=len, reverse=True))) + "))"
+)
+
+
+def parse_sections(eval_str):
     """
-    Parses a column of LLM evaluation strings and extracts rubric scores into
-    separate columns. Supports two formats:
+    Parse one evaluation string into its list of sections. Supports two
+    formats:
       - Wrapped:  {'sections': [{criterion, score, ...}, ...]}
       - Flat list: [{criterion, score, ...}, ...]
+    JSON is tried first since it is much cheaper to parse than a Python
+    literal. Returns None if the string cannot be parsed.
     """
-    # Initialize all rubric columns with NA
-    for rubric in RUBRIC_KEYWORDS:
-        df[rubric] = pd.NA
-
-    def normalize(text: str) -> str:
-        """Lowercase and strip punctuation for robust keyword matching."""
-        return re.sub(r"[^\w\s]", "", text.lower())
-
-    for idx, eval_str in df[eval_col].items():
-        # --- Parse the evaluation string ---
+    try:
+        parsed = json.loads(eval_str)
+    except Exception:
         try:
             parsed = ast.literal_eval(eval_str)
+        except Exception:
+            return None
+
+    if isinstance(parsed, dict):
+        return parsed.get("sections", [])
+    if isinstance(parsed, list):
+        return parsed
+    return None
+
+
+def add_rubric_columns_keyword_match(df: pd.DataFrame, eval_col: str):
+    """
+    Parses a column of LLM evaluation strings and extracts rubric scores into
+    separate columns.
+
+    All sections are exploded into one long frame, criterion names are
+    matched through EXACT_MATCHES (falling back to KEYWORD_PATTERN only for
+    misses), and scores are pivoted back to wide in one step. If a row has
+    several sections for the same rubric, the last one wins.
+
+    Returns:
+        (DataFrame, DataFrame): the input with one column per rubric, and a
+        diagnostics report with one row per (status, raw criterion) for
+        parse errors, unmatched and ambiguous sections.
+    """
+    df = df.copy()
 
-            # Handle both formats: wrapped dict or flat list
-            if isinstance(parsed, dict):
-                sections = parsed.get("sections", [])
-            elif isinstance(parsed, list):
-                sections = parsed
-            else:
-                print(f"[UNKNOWN FORMAT] row {idx}: {type(parsed)}")
-                continue
+    # --- Parse every row once ---
+    parsed = pd.Series([parse_sections(s) for s in df[eval_col]], index=df.index)
+    parse_errors = parsed[parsed.isna()]
 
-        except Exception as e:
-            print(f"[PARSE ERROR] row {idx}: {e}")
-            continue
+    # --- Explode all sections into a long frame ---
+    long = pd.DataFrame(
+        [
+            (idx, str(section.get("criterion", "")), section.get("score"))
+            for idx, sections in parsed.dropna().items()
+            for section in sections
+            if isinstance(section, dict)
+        ],
+        columns=["row", "criterion_raw", "score"],
+    )
 
-        # --- Match each section to a rubric criterion ---
-        for section in sections:
-            crit_raw = section.get("criterion", "")
-            crit_name = crit_raw.split(":")[0]
-            crit = normalize(crit_name)
-            score = section.get("score")
+    # --- Match criteria: exact lookup first, keyword regex for misses ---
+    crit = normalize(long["criterion_raw"].str.split(":").str[0])
+    long["rubric"] = crit.map(EXACT_MATCHES)
+    long["status"] = "matched"
 
-            matches = [
-                rubric
-                for rubric, keywords in RUBRIC_KEYWORDS.items()
-                if any(k in crit for k in keywords)
-            ]
+    misses = long["rubric"].isna()
+    candidates = crit[misses].map(
+        lambda c: {KEYWORD_TO_RUBRIC[k] for k in KEYWORD_PATTERN.findall(c)}
+    )
+    n_candidates = candidates.map(len)
 
-            if len(matches) == 0:
-                print(f"[UNMATCHED] row {idx}: '{crit_raw}'")
-                continue
+    long.loc[misses, "rubric"] = candidates[n_candidates == 1].map(lambda c: next(iter(c)))
+    long.loc[n_candidates[n_candidates == 0].index, "status"] = "unmatched"
+    long.loc[n_candidates[n_candidates > 1].index, "status"] = "ambiguous"
 
-            if len(matches) > 1:
-                print(f"[AMBIGUOUS] row {idx}: '{crit_raw}' → {matches}")
-                continue
+    # --- Pivot matched scores back to wide ---
+    matched = long[long["status"] == "matched"].drop_duplicates(subset=["row", "rubric"], keep="last")
+    scores = (
+        matched.pivot(index="row", columns="rubric", values="score")
+        .reindex(index=df.index, columns=list(RUBRIC_KEYWORDS))
+    )
+    df[list(RUBRIC_KEYWORDS)] = scores
 
-            df.at[idx, matches[0]] = score
+    # --- Diagnostics report ---
+    issues = long.loc[long["status"] != "matched", ["status", "criterion_raw"]]
+    issues = pd.concat([
+        issues,
+        pd.DataFrame({"status": "parse_error", "criterion_raw": pd.NA}, index=parse_errors.index),
+    ])
+    report = (
+        issues.groupby(["status", "criterion_raw"], dropna=False)
+        .size()
+        .rename("count")
+        .reset_index()
+        .sort_values(["status", "count"], ascending=[True, False], ignore_index=True)
+    )
 
-    return df
+    return df, report
 
 
 # --- Load, process, and save ---
 df = pd.read_csv('~/Documents/Who_Writes_What/data/processed/llm_evaluated/raw_evaluations/Hengel_evaluations.csv')
 df.dropna(subset='evaluation_nber_parsed', inplace=True)
 df.drop_duplicates(subset=['NberID', 'evaluation_nber_parsed'], inplace=True)
-df = add_rubric_columns_keyword_match(df, eval_col="evaluation_nber_parsed")
+df, report = add_rubric_columns_keyword_match(df, eval_col="evaluation_nber_parsed")
+print(report.to_string(index=False))
+report.to_csv('~/Documents/Who_Writes_What/data/processed/llm_evaluated/clean_evaluations/Hengel_nber_evaluations_match_report.csv', index=False)
 df.to_csv('~/Documents/Who_Writes_What/data/processed/llm_evaluated/clean_evaluations/Hengel_nber_evaluations.csv')
\ No newline at end of file
@@ -6,12 +6,21 @@ Output:
   outputs/tables/tex/Table-Corr.tex              — lower-triangle LaTeX table
 """
 
-import pandas as pd
+import sys
 from pathlib import Path
 
+from helper_scripts.evaluation_store import attach_scores
+from helper_scripts.rubric import RUBRIC_VERSION
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from merged_data import load_merged_evaluations
+
 ROOT = Path(__file__).parents[2]
 
 DATA_PATH = ROOT / 'data/processed/llm_evaluated/clean_evaluations/merged_evaluations.csv'
+EVAL_STORE = ROOT / 'data/processed/llm_evaluated/evaluations.parquet'
+# Store scores are only used for this model and the current rubric text
+STORE_MODEL = 'gpt-5'
 CSV_OUT   = ROOT / 'outputs/tables/csv/llm_correlation_matrix.csv'
 TEX_OUT   = ROOT / 'outputs/tables/tex/Table-Corr.tex'
 
@@ -59,13 +68,16 @@ SHORT = {
 EXCL_PATTERNS = ['corrigendum', 'erratum', ': a correction', ': correction']
 
 # ── 1. Load & filter ──────────────────────────────────────────────────────────
-df = pd.read_csv(DATA_PATH)
+df = load_merged_evaluations(['Journal', 'Language', 'Title'] + LLM_COLS, path=DATA_PATH)
+# Prefer typed scores from the columnar evaluation store when it exists
+if EVAL_STORE.exists():
+    df = attach_scores(df, EVAL_STORE, LLM_COLS, STORE_MODEL, RUBRIC_VERSION)
 df = df[df['Journal'].isin(JOURNALS)]
 df = df[df['Language'] == 'English']
 mask = df['Title'].str.lower().str.contains('|'.join(EXCL_PATTERNS), na=False)
 df = df[~mask]
 df = df.drop_duplicates('ArticleID')
-data = df[LLM_COLS].apply(pd.to_numeric, errors='coerce').dropna()
+data = df[LLM_COLS].dropna().astype(float)
 N = len(data)
 print(f"Article-level observations (main journals, complete LLM data): {N:,}")
 
@@ -0,0 +1,268 @@
+import asyncio
+import random
+import re
+import time
+from typing import List, Dict, Optional
+
+import httpx
+
+from src.config import API_KEY, TIMEOUT, logger
+from src.api_requests import make_request_body
+from batch_runner import (
+    parse_response_record,
+    split_cached,
+    store_cached,
+    new_usage_totals,
+    log_cache_hit_ratio,
+)
+
+
+BASE_URL = "https://api.openai.com/v1"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: Optional[str]) -> float:
+    """
+    Convert a rate-limit reset header ('20ms', '1s', '6m0s') to seconds.
+    """
+    if not value:
+        return 0.0
+    return sum(float(n) * _DURATION_SECONDS[unit] for n, unit in _DURATION_PART.findall(value))
+
+
+class TokenBucket:
+    """
+    Continuously refilling bucket holding up to one minute's allowance.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        amount = min(amount, self.capacity)
+        blocked = max(0.0, self.blocked_until - time.monotonic())
+        if self.level >= amount:
+            return blocked
+        return max(blocked, (amount - self.level) / self.rate)
+
+    def consume(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+    def sync(self, limit: Optional[str], remaining: Optional[str], reset: Optional[str]) -> None:
+        """
+        Align the bucket with the server's view from x-ratelimit-* headers.
+        """
+        self._refill()
+        if limit:
+            self.capacity = float(limit)
+            self.rate = self.capacity / 60.0
+        if remaining is not None:
+            self.level = min(self.level, float(remaining))
+            if float(remaining) <= 0:
+                self.blocked_until = time.monotonic() + parse_reset(reset)
+
+
+class RateLimiter:
+    """
+    Request and token buckets shared by all workers, driven by the
+    rate-limit response headers.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, est_tokens: int) -> None:
+        # Waiters queue on the lock, so capacity is handed out in FIFO order
+        async with self.lock:
+            while True:
+                wait = max(self.requests.wait_time(1), self.tokens.wait_time(est_tokens))
+                if wait <= 0:
+                    self.requests.consume(1)
+                    self.tokens.consume(est_tokens)
+                    return
+                await asyncio.sleep(wait)
+
+    def update(self, headers) -> None:
+        self.requests.sync(
+            headers.get("x-ratelimit-limit-requests"),
+            headers.get("x-ratelimit-remaining-requests"),
+            headers.get("x-ratelimit-reset-requests"),
+        )
+        self.tokens.sync(
+            headers.get("x-ratelimit-limit-tokens"),
+            headers.get("x-ratelimit-remaining-tokens"),
+            headers.get("x-ratelimit-reset-tokens"),
+        )
+
+
+def backoff_delay(attempt: int, headers=None, status_code: Optional[int] = None) -> float:
+    """
+    Exponential backoff with jitter. A longer Retry-After, or on a 429 a
+    longer rate-limit reset, extends the wait; neither can shorten it
+    (the reset headers are sent on every response, not only when limited).
+    """
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+    if headers is None:
+        return delay
+
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(delay, float(retry_after))
+        except ValueError:
+            pass
+
+    if status_code == 429:
+        delay = max(
+            delay,
+            parse_reset(headers.get("x-ratelimit-reset-requests")),
+            parse_reset(headers.get("x-ratelimit-reset-tokens")),
+        )
+
+    return delay
+
+
+async def evaluate_one(
+    http: httpx.AsyncClient,
+    limiter: RateLimiter,
+    body: Dict,
+    cid: str,
+    max_retries: int,
+    usage: Dict,
+) -> Dict:
+    """
+    Send one Responses request, retrying 429/5xx and transport errors.
+    """
+    # Rough token estimate (~4 characters per token) for the token bucket
+    est_tokens = len(str(body["input"])) // 4
+    error = None
+
+    for attempt in range(max_retries + 1):
+        await limiter.acquire(est_tokens)
+
+        try:
+            response = await http.post("/responses", json=body)
+        except httpx.TransportError as e:
+            error = f"Transport error: {e}"
+            logger.warning("Request %s failed (%s), attempt %d", cid, error, attempt + 1)
+            await asyncio.sleep(backoff_delay(attempt))
+            continue
+
+        limiter.update(response.headers)
+
+        if response.status_code == 200:
+            try:
+                body_json = response.json()
+            except ValueError as e:
+                # Truncated or non-JSON body: fail this request only
+                error = f"Invalid JSON in response: {e}"
+                logger.error("Request %s failed: %s", cid, error)
+                break
+            record = {"custom_id": cid, "response": {"status_code": 200, "body": body_json}}
+            return parse_response_record(record, usage)
+
+        error = f"HTTP {response.status_code}: {response.text[:200]}"
+
+        if response.status_code not in RETRY_STATUSES:
+            break
+
+        logger.warning("Request %s got %s, attempt %d", cid, response.status_code, attempt + 1)
+        await asyncio.sleep(backoff_delay(attempt, response.headers, response.status_code))
+
+    logger.error("Request %s failed: %s", cid, error)
+    return {
+        "id": cid,
+        "output": None,
+        "validation_passed": False,
+        "validation_reason": error,
+    }
+
+
+async def async_call_and_validate(
+    passages: List[str],
+    custom_ids: List[str],
+    rubric_checklist: str,
+    concurrency: int = 8,
+    requests_per_minute: float = 500,
+    tokens_per_minute: float = 500_000,
+    max_retries: int = 5,
+    base_url: str = BASE_URL,
+    api_key: str = API_KEY,
+    cache=None,
+) -> List[Dict]:
+    """
+    Evaluate passages through the synchronous Responses endpoint with a
+    pool of asyncio workers.
+
+    Requests are the same bodies the batch runner uploads, throttled by a
+    token bucket that is re-synced from the x-ratelimit-* response headers
+    and retried with exponential backoff on 429/5xx. Point base_url at a
+    local server to run against a mock.
+
+    Returns:
+        List[Dict]: One result dict per passage, in the same format as
+        batch_call_and_validate.
+    """
+    if len(passages) != len(custom_ids):
+        raise ValueError("passages and custom_ids must have the same length")
+
+    all_passages, all_ids = passages, custom_ids
+    cached, passages, custom_ids = split_cached(passages, custom_ids, rubric_checklist, cache)
+
+    limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+    usage = new_usage_totals()
+    results: List[Optional[Dict]] = [None] * len(passages)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(len(passages)):
+        queue.put_nowait(i)
+
+    headers = {"Authorization": f"Bearer {api_key}"}
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=TIMEOUT) as http:
+
+        async def worker():
+            while True:
+                try:
+                    i = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                body = make_request_body(rubric_checklist, passages[i])
+                results[i] = await evaluate_one(http, limiter, body, custom_ids[i], max_retries, usage)
+
+        logger.info("Evaluating %d passages with %d workers", len(passages), concurrency)
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    log_cache_hit_ratio(usage, "Concurrent run")
+    store_cached(results, all_passages, all_ids, rubric_checklist, cache)
+
+    return cached + results
+
+
+def concurrent_call_and_validate(
+    passages: List[str],
+    custom_ids: List[str],
+    rubric_checklist: str,
+    **kwargs,
+) -> List[Dict]:
+    """
+    Blocking wrapper around async_call_and_validate.
+    """
+    return asyncio.run(async_call_and_validate(passages, custom_ids, rubric_checklist, **kwargs))
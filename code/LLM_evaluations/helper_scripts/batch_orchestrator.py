@@ -0,0 +1,344 @@
+import hashlib
+import json
+import os
+import time
+from typing import List, Dict
+
+from src.config import client, logger
+from batch_runner import (
+    TERMINAL_STATUSES,
+    write_batch_file,
+    launch_batch,
+    log_batch_errors,
+    download_output,
+    iter_output_results,
+    iter_error_results,
+    failed_ids,
+    retry_failed,
+    new_usage_totals,
+    log_cache_hit_ratio,
+    split_cached,
+    store_cached,
+)
+
+
+def ids_fingerprint(custom_ids: List[str]) -> str:
+    """
+    Stable hash of an ordered list of custom_ids, used to recognise a chunk
+    across restarts.
+    """
+    return hashlib.sha256("\n".join(custom_ids).encode("utf-8")).hexdigest()
+
+
+def load_state(state_file: str) -> Dict:
+    if not os.path.exists(state_file):
+        return {"chunks": []}
+
+    with open(state_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state: Dict, state_file: str) -> None:
+    """
+    Persist orchestrator state atomically so a crash mid-write never leaves a
+    truncated state file behind.
+    """
+    tmp_file = state_file + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_file, state_file)
+
+
+def plan_chunks(
+    custom_ids: List[str],
+    batch_size: int,
+    work_dir: str,
+    state: Dict,
+    key: str = "chunks",
+) -> List[Dict]:
+    """
+    Split custom_ids into batch-sized chunks and reconcile them with any
+    chunks recorded under state[key] by a previous run. Chunks are matched
+    on the fingerprint of their custom_ids, so a changed input simply plans
+    new chunks alongside the old ones.
+    """
+    previous = {c["fingerprint"]: c for c in state.get(key, [])}
+    chunks = []
+
+    for index, start in enumerate(range(0, len(custom_ids), batch_size)):
+        chunk_ids = custom_ids[start:start + batch_size]
+        fingerprint = ids_fingerprint(chunk_ids)
+
+        chunk = previous.get(fingerprint)
+        if chunk is None:
+            chunk = {
+                "fingerprint": fingerprint,
+                "batch_file": os.path.join(work_dir, f"batch_{fingerprint[:12]}.jsonl"),
+                "output_path": os.path.join(work_dir, f"output_{fingerprint[:12]}.jsonl"),
+                "error_path": os.path.join(work_dir, f"errors_{fingerprint[:12]}.jsonl"),
+                "batch_id": None,
+                "input_file_id": None,
+                "output_file_id": None,
+                "error_file_id": None,
+                "status": None,
+                "downloaded": False,
+            }
+
+        chunk.update({"index": index, "start": start, "size": len(chunk_ids)})
+
+        # Outputs removed from disk are downloaded again rather than re-run
+        if chunk["downloaded"] and not all(
+            os.path.exists(chunk[path])
+            for file_id, path in (("output_file_id", "output_path"), ("error_file_id", "error_path"))
+            if chunk[file_id]
+        ):
+            chunk["downloaded"] = False
+
+        chunks.append(chunk)
+
+    return chunks
+
+
+def submit_pending(
+    chunks: List[Dict],
+    passages: List[str],
+    custom_ids: List[str],
+    rubric_checklist: str,
+    state: Dict,
+    state_file: str,
+) -> None:
+    """
+    Launch a batch for every chunk that has none in flight. Chunks whose
+    previous batch failed or expired without output are resubmitted.
+    """
+    for chunk in chunks:
+        resubmit = chunk["status"] == "failed_final"
+        if chunk["batch_id"] and not resubmit:
+            logger.info("Chunk %d: re-attaching to batch %s", chunk["index"], chunk["batch_id"])
+            continue
+
+        start, end = chunk["start"], chunk["start"] + chunk["size"]
+        write_batch_file(passages[start:end], custom_ids[start:end], rubric_checklist, chunk["batch_file"])
+        batch_id, input_file_id = launch_batch(chunk["batch_file"])
+
+        chunk.update({
+            "batch_id": batch_id,
+            "input_file_id": input_file_id,
+            "output_file_id": None,
+            "error_file_id": None,
+            "status": "validating",
+            "downloaded": False,
+        })
+
+        # Record each submission immediately so a crash cannot orphan a batch
+        save_state(state, state_file)
+
+
+def poll_until_done(
+    chunks: List[Dict],
+    state: Dict,
+    state_file: str,
+    poll_interval: int,
+) -> None:
+    """
+    Poll all in-flight batches together, downloading each output file as
+    soon as its batch finishes.
+    """
+    while True:
+        pending = [c for c in chunks if not c["downloaded"] and c["status"] != "failed_final"]
+
+        for chunk in pending:
+            if chunk["status"] not in TERMINAL_STATUSES:
+                status = client.batches.retrieve(chunk["batch_id"])
+                chunk["status"] = status.status
+                chunk["output_file_id"] = getattr(status, "output_file_id", None)
+                chunk["error_file_id"] = getattr(status, "error_file_id", None)
+                logger.info("Chunk %d batch %s status: %s", chunk["index"], chunk["batch_id"], status.status)
+
+                if status.status in TERMINAL_STATUSES and status.status != "completed":
+                    logger.error("Chunk %d batch terminated with status: %s", chunk["index"], status.status)
+                    log_batch_errors(status)
+
+            if chunk["status"] not in TERMINAL_STATUSES:
+                continue
+
+            # Expired batches can still carry partial output worth keeping;
+            # per-request errors are kept so only those requests are retried
+            if chunk["output_file_id"] or chunk["error_file_id"]:
+                if chunk["output_file_id"]:
+                    download_output(chunk["output_file_id"], chunk["output_path"])
+                if chunk["error_file_id"]:
+                    download_output(chunk["error_file_id"], chunk["error_path"])
+                chunk["downloaded"] = True
+                logger.info("Chunk %d: results downloaded", chunk["index"])
+            else:
+                logger.error("Chunk %d: batch finished without output", chunk["index"])
+                chunk["status"] = "failed_final"
+
+        save_state(state, state_file)
+
+        if all(c["downloaded"] or c["status"] == "failed_final" for c in chunks):
+            return
+
+        time.sleep(poll_interval)
+
+
+def collect_results(chunks: List[Dict]) -> List[Dict]:
+    """
+    Parse the downloaded output and error files of every finished chunk.
+    """
+    results = []
+    for chunk in chunks:
+        if not chunk["downloaded"]:
+            continue
+        if chunk["output_file_id"]:
+            usage = new_usage_totals()
+            results.extend(iter_output_results(chunk["output_path"], usage, chunk["batch_id"]))
+            log_cache_hit_ratio(usage, f"Chunk {chunk['index']} batch {chunk['batch_id']}")
+        if chunk["error_file_id"]:
+            results.extend(iter_error_results(chunk["error_path"], chunk["batch_id"]))
+
+    return results
+
+
+def retry_in_batches(
+    results: List[Dict],
+    passages: List[str],
+    custom_ids: List[str],
+    rubric_checklist: str,
+    rounds: int,
+    batch_size: int,
+    work_dir: str,
+    state: Dict,
+    state_file: str,
+    poll_interval: int,
+    cache=None,
+) -> List[Dict]:
+    """
+    batch_runner.retry_failed with every round going through the same
+    checkpointed submit / poll path as the first pass.
+
+    Round N's chunks are recorded under state["retry_chunks_N"] (and their
+    files kept in work_dir/retry_N), so a rerun after a crash re-attaches
+    to them instead of paying again, while the same IDs failing again in a
+    later round still get a new batch. A retry batch that ends without
+    output does not discard what has been merged so far; the ids still
+    failing are kept in state["failed_ids"].
+    """
+    def submit_round(round_no, retry_passages, retry_ids):
+        key = f"retry_chunks_{round_no}"
+        retry_dir = os.path.join(work_dir, f"retry_{round_no}")
+        os.makedirs(retry_dir, exist_ok=True)
+
+        chunks = plan_chunks(retry_ids, batch_size, retry_dir, state, key=key)
+        state[key] = chunks
+        save_state(state, state_file)
+
+        submit_pending(chunks, retry_passages, retry_ids, rubric_checklist, state, state_file)
+        poll_until_done(chunks, state, state_file, poll_interval)
+
+        failed = [c["index"] for c in chunks if not c["downloaded"]]
+        if failed:
+            logger.error("Retry round %d: chunks without output: %s", round_no, failed)
+
+        retried = collect_results(chunks)
+        store_cached(retried, retry_passages, retry_ids, rubric_checklist, cache)
+        return retried
+
+    results = retry_failed(
+        results,
+        passages,
+        custom_ids,
+        rubric_checklist,
+        rounds=rounds,
+        cache=cache,
+        submit=submit_round,
+    )
+
+    state["failed_ids"] = failed_ids(results, custom_ids)
+    save_state(state, state_file)
+
+    return results
+
+
+def run_batches(
+    passages: List[str],
+    custom_ids: List[str],
+    rubric_checklist: str,
+    state_file: str = "batch_state.json",
+    work_dir: str = "batches",
+    batch_size: int = 1000,
+    poll_interval: int = 60,
+    cache=None,
+    retry_rounds: int = 2,
+) -> List[Dict]:
+    """
+    Evaluate passages as concurrent, checkpointed OpenAI batches.
+
+    All chunks are submitted up front and polled together, so wall-clock time
+    is that of the slowest batch rather than the sum of all batches. Batch IDs
+    and file IDs are recorded in a JSON state file; rerunning with the same
+    inputs re-attaches to in-flight batches and only downloads outputs that
+    are not already on disk.
+
+    Args:
+        passages (List[str]): Text passages to evaluate.
+        custom_ids (List[str]): Unique identifiers for each passage.
+        rubric_checklist (str): Rubric text sent with every passage.
+        state_file (str): Path to the JSON file tracking batch progress.
+        work_dir (str): Directory for per-chunk batch and output files.
+        batch_size (int): Maximum number of requests per batch.
+        poll_interval (int): Seconds between polling rounds.
+        cache (ResultCache, optional): Cache consulted before chunking; only
+            misses are submitted. Updated once every batch has finished so
+            that a restart plans the same chunks as the interrupted run.
+        retry_rounds (int): Maximum number of follow-up rounds for
+            requests that errored or failed validation across all chunks.
+            Retry batches are checkpointed like the first pass; ids still
+            failing afterwards are recorded in the state file.
+
+    Returns:
+        List[Dict]: Result dicts in the same format as batch_call_and_validate.
+    """
+    if len(passages) != len(custom_ids):
+        raise ValueError("passages and custom_ids must have the same length")
+
+    os.makedirs(work_dir, exist_ok=True)
+
+    all_passages, all_ids = passages, custom_ids
+    cached, passages, custom_ids = split_cached(passages, custom_ids, rubric_checklist, cache)
+
+    state = load_state(state_file)
+    chunks = plan_chunks(custom_ids, batch_size, work_dir, state)
+    state["chunks"] = chunks
+    save_state(state, state_file)
+
+    logger.info("Orchestrating %d requests across %d batches", len(custom_ids), len(chunks))
+
+    submit_pending(chunks, passages, custom_ids, rubric_checklist, state, state_file)
+    poll_until_done(chunks, state, state_file, poll_interval)
+
+    results = collect_results(chunks)
+
+    failed = [c["index"] for c in chunks if not c["downloaded"]]
+    if failed:
+        logger.error("Chunks without output: %s (rerun to resubmit them)", failed)
+        raise RuntimeError(f"{len(failed)} batch(es) did not produce output: {failed}")
+
+    store_cached(results, all_passages, all_ids, rubric_checklist, cache)
+
+    results = retry_in_batches(
+        results,
+        passages,
+        custom_ids,
+        rubric_checklist,
+        rounds=retry_rounds,
+        batch_size=batch_size,
+        work_dir=work_dir,
+        state=state,
+        state_file=state_file,
+        poll_interval=poll_interval,
+        cache=cache,
+    )
+
+    return cached + results
@@ -1,12 +1,359 @@
 import json
+import os
 import time
-import sys
-from typing import List, Dict
+from typing import Callable, List, Dict, Tuple, Iterator
 
 from src.config import client, logger
 from src.api_requests import make_single_request
-from src.validation import validate_schema
+from src.validation import validate_schema, build_rubric_validator
 from src.prompt import extract_schema_output
+from src.cache import cache_key
+from rubric import LIST_RUBRIC
+
+
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# Batch API input limits
+MAX_BATCH_REQUESTS = 50_000
+MAX_BATCH_BYTES = 200 * 1024 * 1024
+
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+# Compiled once; rejects outputs with missing, duplicate or renamed
+# criteria so they are requeued by retry_failed
+RUBRIC_VALIDATOR = build_rubric_validator(LIST_RUBRIC)
+
+
+def split_cached(
+    passages: List[str],
+    custom_ids: List[str],
+    rubric_checklist: str,
+    cache,
+) -> Tuple[List[Dict], List[str], List[str]]:
+    """
+    Separate passages already evaluated under the current model, prompt,
+    schema and rubric from those that still need an API call.
+
+    Returns:
+        Tuple: (cached result dicts, uncached passages, uncached custom_ids)
+    """
+    if cache is None:
+        return [], list(passages), list(custom_ids)
+
+    keys = [cache_key(rubric_checklist, passage) for passage in passages]
+    found = cache.get_many(keys)
+
+    hits, miss_passages, miss_ids = [], [], []
+    for passage, cid, key in zip(passages, custom_ids, keys):
+        if key in found:
+            hits.append({
+                "id": cid,
+                "output": found[key],
+                "validation_passed": True,
+                "validation_reason": "OK (cached)",
+            })
+        else:
+            miss_passages.append(passage)
+            miss_ids.append(cid)
+
+    logger.info("Result cache: %d hits, %d misses", len(hits), len(miss_ids))
+    return hits, miss_passages, miss_ids
+
+
+def store_cached(
+    results: List[Dict],
+    passages: List[str],
+    custom_ids: List[str],
+    rubric_checklist: str,
+    cache,
+) -> None:
+    """
+    Add every schema-valid result to the cache.
+    """
+    if cache is None:
+        return
+
+    passage_by_id = dict(zip(custom_ids, passages))
+    cache.put_many(
+        (cache_key(rubric_checklist, passage_by_id[r["id"]]), r["output"])
+        for r in results
+        if r["validation_passed"] and r["id"] in passage_by_id
+    )
+
+
+def write_batch_file(
+    passages: List[str],
+    custom_ids: List[str],
+    rubric_checklist: str,
+    batch_file: str,
+) -> None:
+    """
+    Write one Responses API request per passage to a JSONL batch file.
+
+    Each request is checked as it is serialized (non-empty, unique
+    custom_id) and the running totals are checked against the Batch API
+    request and size limits, so no second pass over the file is needed.
+    """
+    logger.info("Building batch file with %d requests", len(passages))
+
+    if len(passages) > MAX_BATCH_REQUESTS:
+        raise ValueError(f"Batch has {len(passages)} requests; the limit is {MAX_BATCH_REQUESTS}")
+
+    seen_ids = set()
+    total_bytes = 0
+
+    with open(batch_file, "wb") as f:
+        for passage, cid in zip(passages, custom_ids):
+            if not isinstance(cid, str) or not cid:
+                raise ValueError(f"custom_id must be a non-empty string, got {cid!r}")
+            if cid in seen_ids:
+                raise ValueError(f"Duplicate custom_id in batch: {cid}")
+            seen_ids.add(cid)
+
+            request = make_single_request(rubric_checklist=rubric_checklist, passage=passage, custom_id=cid)
+            line = (json.dumps(request) + "\n").encode("utf-8")
+
+            total_bytes += len(line)
+            if total_bytes > MAX_BATCH_BYTES:
+                raise ValueError(f"Batch file exceeds {MAX_BATCH_BYTES} bytes at custom_id {cid}")
+
+            f.write(line)
+
+    logger.info("Batch file written: %d requests, %.1f MB", len(seen_ids), total_bytes / 1e6)
+
+
+def launch_batch(batch_file: str) -> Tuple[str, str]:
+    """
+    Upload a JSONL batch file and start a 24h batch over it.
+
+    Returns:
+        Tuple[str, str]: (batch_id, input_file_id)
+    """
+    logger.info("Uploading batch file %s", batch_file)
+    with open(batch_file, "rb") as f:
+        file_obj = client.files.create(file=f, purpose="batch")
+
+    batch = client.batches.create(
+        input_file_id=file_obj.id,
+        endpoint="/v1/responses",
+        completion_window="24h"
+    )
+
+    logger.info("Batch launched with ID: %s", batch.id)
+    return batch.id, file_obj.id
+
+
+def log_batch_errors(status) -> None:
+    """
+    Log the batch-level errors attached to a terminated batch, if any.
+    """
+    if getattr(status, "errors", None):
+        try:
+            logger.error(
+                "Batch errors:\n%s",
+                json.dumps(status.errors, indent=2, default=str)
+            )
+        except Exception:
+            logger.error("Could not serialize batch error details")
+
+
+def download_output(output_file_id: str, output_path: str) -> None:
+    """
+    Stream a batch output file to disk in fixed-size chunks, so the full
+    file is never held in memory.
+    """
+    with client.files.with_streaming_response.content(output_file_id) as response:
+        with open(output_path, "wb") as f:
+            for chunk in response.iter_bytes(chunk_size=DOWNLOAD_CHUNK_BYTES):
+                f.write(chunk)
+
+
+def new_usage_totals() -> Dict:
+    return {"requests": 0, "input_tokens": 0, "cached_tokens": 0}
+
+
+def add_usage(totals: Dict, body: Dict) -> None:
+    """
+    Accumulate input and cached-input token counts from a response body.
+    """
+    usage = body.get("usage") or {}
+    details = usage.get("input_tokens_details") or {}
+
+    totals["requests"] += 1
+    totals["input_tokens"] += usage.get("input_tokens") or 0
+    totals["cached_tokens"] += details.get("cached_tokens") or 0
+
+
+def log_cache_hit_ratio(totals: Dict, label: str) -> None:
+    """
+    Log the share of input tokens served from the prompt cache.
+    """
+    ratio = totals["cached_tokens"] / totals["input_tokens"] if totals["input_tokens"] else 0.0
+    logger.info(
+        "%s: prompt cache hit ratio %.1f%% (%d of %d input tokens cached over %d requests)",
+        label,
+        100 * ratio,
+        totals["cached_tokens"],
+        totals["input_tokens"],
+        totals["requests"],
+    )
+
+
+def parse_response_record(record: Dict, usage: Dict = None) -> Dict:
+    """
+    Extract and validate the schema-constrained output of one batch output
+    record, adding its token usage to `usage` if given.
+
+    Returns:
+        Dict: Result dict containing:
+            - id
+            - output (schema-validated JSON)
+            - validation_passed
+            - validation_reason
+    """
+    cid = record.get("custom_id")
+    response = record.get("response") or {}
+    body = response.get("body") or {}
+
+    if usage is not None:
+        add_usage(usage, body)
+
+    try:
+        # With schema enforcement, the JSON payload is directly available
+        output_json = extract_schema_output(body)
+
+        valid, reason = validate_schema(output_json, RUBRIC_VALIDATOR)
+
+        logger.info(
+            "Result %s: schema validation %s",
+            cid,
+            "PASSED" if valid else f"FAILED ({reason})"
+        )
+
+        return {
+            "id": cid,
+            "output": output_json,
+            "validation_passed": valid,
+            "validation_reason": reason,
+        }
+
+    except Exception as e:
+        logger.error("Failed to process output for %s: %s", cid, e)
+        return {
+            "id": cid,
+            "output": None,
+            "validation_passed": False,
+            "validation_reason": str(e),
+        }
+
+
+def iter_output_results(output_path: str, usage: Dict = None, batch_id: str = None) -> Iterator[Dict]:
+    """
+    Lazily parse a downloaded batch output file, yielding one result dict
+    per line tagged with the batch it came from.
+    """
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                result = parse_response_record(json.loads(line), usage)
+                result["batch_id"] = batch_id
+                yield result
+
+
+def iter_error_results(error_path: str, batch_id: str = None) -> Iterator[Dict]:
+    """
+    Lazily parse a downloaded batch error file, yielding a failed result
+    dict for every request the batch could not complete.
+    """
+    with open(error_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+
+            record = json.loads(line)
+            cid = record.get("custom_id")
+            error = record.get("error") or {}
+            body = (record.get("response") or {}).get("body") or {}
+            reason = error.get("message") or (body.get("error") or {}).get("message") or "Request failed"
+
+            logger.error("Request %s failed in batch: %s", cid, reason)
+            yield {
+                "id": cid,
+                "output": None,
+                "validation_passed": False,
+                "validation_reason": reason,
+                "batch_id": batch_id,
+            }
+
+
+def failed_ids(results: List[Dict], custom_ids: List[str]) -> List[str]:
+    """
+    custom_ids with no result at all or whose result failed extraction or
+    validation, in input order.
+    """
+    passed = {r["id"] for r in results if r["validation_passed"]}
+    return [cid for cid in custom_ids if cid not in passed]
+
+
+def merge_results(results: List[Dict], retried: List[Dict]) -> List[Dict]:
+    """
+    Replace results by id with their retried counterparts; retried ids
+    absent from `results` are appended.
+    """
+    by_id = {r["id"]: r for r in retried}
+    merged = [by_id.pop(r["id"], r) for r in results]
+    return merged + list(by_id.values())
+
+
+def retry_failed(
+    results: List[Dict],
+    passages: List[str],
+    custom_ids: List[str],
+    rubric_checklist: str,
+    rounds: int,
+    batch_prefix: str = "batch_retry",
+    poll_interval: int = 60,
+    cache=None,
+    submit: Callable[[int, List[str], List[str]], List[Dict]] = None,
+) -> List[Dict]:
+    """
+    Resubmit only failed or missing custom_ids as follow-up batches, for up
+    to `rounds` rounds, merging successes into the original results.
+
+    `submit(round_no, passages, custom_ids)` runs one round and returns its
+    results; by default each round is a single blocking batch named after
+    `batch_prefix`.
+    """
+    if submit is None:
+        def submit(round_no, retry_passages, retry_ids):
+            return batch_call_and_validate(
+                passages=retry_passages,
+                custom_ids=retry_ids,
+                rubric_checklist=rubric_checklist,
+                batch_file=f"{batch_prefix}_{round_no}.jsonl",
+                output_file=f"{batch_prefix}_{round_no}_output.jsonl",
+                poll_interval=poll_interval,
+                cache=cache,
+                retry_rounds=0,
+            )
+
+    passage_by_id = dict(zip(custom_ids, passages))
+
+    for round_no in range(1, rounds + 1):
+        retry_ids = failed_ids(results, custom_ids)
+        if not retry_ids:
+            break
+
+        logger.info("Retry round %d/%d: resubmitting %d failed requests", round_no, rounds, len(retry_ids))
+
+        retried = submit(round_no, [passage_by_id[cid] for cid in retry_ids], retry_ids)
+        results = merge_results(results, retried)
+
+    remaining = failed_ids(results, custom_ids)
+    if remaining:
+        logger.error("%d requests still failed after %d retry rounds", len(remaining), rounds)
+
+    return results
 
 
 def batch_call_and_validate(
@@ -14,17 +361,22 @@ def batch_call_and_validate(
     custom_ids: List[str],
     rubric_checklist: str,
     batch_file: str = "batch.jsonl",
+    output_file: str = "batch_output.jsonl",
     poll_interval: int = 60,
+    cache=None,
+    retry_rounds: int = 2,
 ) -> List[Dict]:
     """
     Execute a schema-enforced OpenAI batch job over a list of passages.
 
     This function:
-    1. Builds a JSONL batch file (one request per passage)
+    0. Skips passages with a cached result (if a cache is given)
+    1. Builds a JSONL batch file (one request per uncached passage)
     2. Uploads and launches the batch
     3. Polls until completion
     4. Retrieves and validates schema-constrained outputs
-    5. Returns structured results keyed by custom_id
+    5. Resubmits failed or schema-invalid requests as follow-up batches
+    6. Returns structured results keyed by custom_id
 
     Assumptions:
     - Output structure is enforced via response_format=json_schema
@@ -35,7 +387,12 @@ def batch_call_and_validate(
         passages (List[str]): Text passages to evaluate.
         custom_ids (List[str]): Unique identifiers for each passage.
         batch_file (str): Path to the temporary JSONL batch file.
+        output_file (str): Path the batch output file is downloaded to.
         poll_interval (int): Seconds between batch status checks.
+        cache (ResultCache, optional): Cache consulted before the batch is
+            built and updated with every schema-valid output.
+        retry_rounds (int): Maximum number of follow-up batches for
+            requests that errored or failed validation.
 
     Returns:
         List[Dict]: One result dict per passage containing:
@@ -52,123 +409,81 @@ def batch_call_and_validate(
         raise ValueError("passages and custom_ids must have the same length")
 
     # ------------------------------------------------------------------
-    # Step 1: Build JSONL batch file
+    # Step 0: Reuse cached evaluations
     # ------------------------------------------------------------------
-    logger.info("Building batch file with %d requests", len(passages))
+    all_passages, all_ids = passages, custom_ids
+    cached, passages, custom_ids = split_cached(passages, custom_ids, rubric_checklist, cache)
 
-    with open(batch_file, "w", encoding="utf-8") as f:
-        for passage, cid in zip(passages, custom_ids):
-            request = make_single_request(rubric_checklist=rubric_checklist, passage=passage, custom_id=cid)
-            f.write(json.dumps(request) + "\n")
-
-    # Defensive check: ensure batch file is valid JSONL
-    with open(batch_file, "r", encoding="utf-8") as f:
-        for line_no, line in enumerate(f, start=1):
-            try:
-                json.loads(line)
-            except json.JSONDecodeError as e:
-                logger.error("Invalid JSON on line %d of batch file: %s", line_no, e)
-                sys.exit(1)
+    if not passages:
+        return cached
 
-    logger.info("Batch file validation passed")
+    # ------------------------------------------------------------------
+    # Step 1: Build JSONL batch file
+    # ------------------------------------------------------------------
+    write_batch_file(passages, custom_ids, rubric_checklist, batch_file)
 
     # ------------------------------------------------------------------
     # Step 2: Upload batch and launch execution
     # ------------------------------------------------------------------
-    logger.info("Uploading batch file")
-    file_obj = client.files.create(
-        file=open(batch_file, "rb"),
-        purpose="batch"
-    )
-
-    batch = client.batches.create(
-        input_file_id=file_obj.id,
-        endpoint="/v1/responses",
-        completion_window="24h"
-    )
-
-    logger.info("Batch launched with ID: %s", batch.id)
+    batch_id, _ = launch_batch(batch_file)
 
     # ------------------------------------------------------------------
     # Step 3: Poll batch status
     # ------------------------------------------------------------------
     while True:
-        status = client.batches.retrieve(batch.id)
+        status = client.batches.retrieve(batch_id)
         logger.info("Batch status: %s", status.status)
 
-        if status.status in {"completed", "failed", "expired"}:
+        if status.status in TERMINAL_STATUSES:
             break
 
         time.sleep(poll_interval)
 
     if status.status != "completed":
         logger.error("Batch terminated with status: %s", status.status)
-
-        if getattr(status, "errors", None):
-            try:
-                logger.error(
-                    "Batch errors:\n%s",
-                    json.dumps(status.errors, indent=2, default=str)
-                )
-            except Exception:
-                logger.error("Could not serialize batch error details")
-
+        log_batch_errors(status)
         raise RuntimeError(f"Batch did not complete successfully: {status.status}")
 
     # ------------------------------------------------------------------
-    # Step 4: Retrieve output file
+    # Step 4: Retrieve output and error files
     # ------------------------------------------------------------------
-    if not getattr(status, "output_file_id", None):
-        logger.error("Batch completed but produced no output file")
-
-        if getattr(status, "error_file_id", None):
-            logger.error("Fetching error file for diagnostics")
-            error_file = client.files.content(status.error_file_id)
-            for i, line in enumerate(error_file.text.splitlines(), start=1):
-                logger.error("Error line %d: %s", i, line)
+    output_file_id = getattr(status, "output_file_id", None)
+    error_file_id = getattr(status, "error_file_id", None)
 
+    if not output_file_id and not error_file_id:
+        logger.error("Batch completed but produced no output file")
         raise RuntimeError("Batch completed without output")
 
-    output_file = client.files.content(status.output_file_id)
-
     # ------------------------------------------------------------------
     # Step 5: Parse and validate schema-constrained outputs
     # ------------------------------------------------------------------
     results = []
 
-    for line in output_file.text.splitlines():
-        record = json.loads(line)
+    if output_file_id:
+        download_output(output_file_id, output_file)
+        usage = new_usage_totals()
+        results.extend(iter_output_results(output_file, usage, batch_id))
+        log_cache_hit_ratio(usage, f"Batch {batch_id}")
 
-        cid = record.get("custom_id")
-        response = record.get("response", {})
-        body = response.get("body", {})
-
-        try:
-            # With schema enforcement, the JSON payload is directly available
-            output_json = extract_schema_output(body)
-
-            valid, reason = validate_schema(output_json)
-
-            results.append({
-                "id": cid,
-                "output": output_json,
-                "validation_passed": valid,
-                "validation_reason": reason,
-            })
+    if error_file_id:
+        error_file = os.path.splitext(output_file)[0] + "_errors.jsonl"
+        download_output(error_file_id, error_file)
+        results.extend(iter_error_results(error_file, batch_id))
 
-            logger.info(
-                "Result %s: schema validation %s",
-                cid,
-                "PASSED" if valid else f"FAILED ({reason})"
-            )
+    store_cached(results, all_passages, all_ids, rubric_checklist, cache)
 
-        except Exception as e:
-            logger.error("Failed to process output for %s: %s", cid, e)
-            results.append({
-                "id": cid,
-                "output": None,
-                "validation_passed": False,
-                "validation_reason": str(e),
-            })
+    # ------------------------------------------------------------------
+    # Step 6: Resubmit only the holes
+    # ------------------------------------------------------------------
+    results = retry_failed(
+        results,
+        passages,
+        custom_ids,
+        rubric_checklist,
+        rounds=retry_rounds,
+        batch_prefix=os.path.splitext(batch_file)[0] + "_retry",
+        poll_interval=poll_interval,
+        cache=cache,
+    )
 
-    return results
\ No newline at end of file
+    return cached + results
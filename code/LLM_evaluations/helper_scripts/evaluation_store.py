@@ -0,0 +1,138 @@
+"""
+Columnar store of LLM rubric evaluations.
+
+One row per (dataset, article, criterion) with the score, justification
+and the model, rubric version and batch that produced it, written as Parquet
+(requires pyarrow). Readers load only the columns and rows they need
+instead of re-parsing stringified outputs from CSV.
+"""
+
+import os
+
+import pandas as pd
+
+
+STORE_COLUMNS = [
+    "dataset",
+    "ArticleID",
+    "criterion",
+    "score",
+    "justification",
+    "model",
+    "rubric_version",
+    "batch_id",
+]
+
+STORE_DTYPES = {
+    "dataset": "category",
+    "ArticleID": "string",
+    "criterion": "category",
+    "score": "Int8",
+    "justification": "string",
+    "model": "category",
+    "rubric_version": "category",
+    "batch_id": "category",
+}
+
+# A re-evaluation replaces the earlier row for the same key
+STORE_KEY = ["dataset", "ArticleID", "criterion", "model", "rubric_version"]
+
+# Article sets evaluated separately, whose ArticleIDs overlap. Scraped
+# Management Science IDs are row numbers of the scrape, which
+# merge_datasets.py shifts by this offset; readers apply the same shift
+# so store rows line up with merged_evaluations.csv.
+DATASET_ID_OFFSETS = {"hengel": 0, "mgsc": 15000}
+
+
+def write_evaluation_store(frame: pd.DataFrame, path: str) -> None:
+    """
+    Merge new long-format evaluations into the Parquet store at `path`.
+    """
+    frame = frame[STORE_COLUMNS].astype(STORE_DTYPES)
+
+    if os.path.exists(path):
+        existing = pd.read_parquet(path)
+        if "dataset" not in existing.columns:
+            # Stores written before datasets were tracked only hold Hengel runs
+            existing["dataset"] = "hengel"
+        frame = pd.concat([existing[STORE_COLUMNS].astype(STORE_DTYPES), frame], ignore_index=True)
+        frame = frame.drop_duplicates(subset=STORE_KEY, keep="last")
+        # Concatenating categoricals with different categories falls back to object
+        frame = frame.astype(STORE_DTYPES)
+
+    tmp_path = path + ".tmp"
+    frame.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def read_evaluation_store(path, columns=None, filters=None) -> pd.DataFrame:
+    """
+    Load the store, reading only `columns` and the row groups matching
+    pyarrow `filters`, e.g. [("model", "==", "gpt-5")].
+    """
+    return pd.read_parquet(path, columns=columns, filters=filters)
+
+
+def read_scores_wide(path, model: str, rubric_version: str, criteria=None, datasets=None) -> pd.DataFrame:
+    """
+    Rubric scores from one model and rubric version as one row per
+    ArticleID and one Int8 column per criterion (in `criteria` order if
+    given). ArticleIDs are those of merged_evaluations.csv, i.e. shifted
+    by DATASET_ID_OFFSETS; pass `datasets` to read only some article sets.
+
+    Raises:
+        ValueError: if an (ArticleID, criterion) pair still has more than
+            one row after filtering, or the store has an unknown dataset.
+    """
+    filters = [("model", "==", model), ("rubric_version", "==", rubric_version)]
+    if datasets is not None:
+        filters.append(("dataset", "in", list(datasets)))
+    long = read_evaluation_store(path, columns=["dataset", "ArticleID", "criterion", "score"], filters=filters)
+    long["criterion"] = long["criterion"].astype(str)
+
+    offsets = long["dataset"].astype(str).map(DATASET_ID_OFFSETS)
+    unknown = long.loc[offsets.isna(), "dataset"].unique()
+    if len(unknown):
+        raise ValueError(f"no ArticleID offset for datasets {list(unknown)}")
+    long["ArticleID"] = pd.to_numeric(long["ArticleID"]).astype("int64") + offsets.astype("int64")
+
+    duplicated = long.duplicated(subset=["ArticleID", "criterion"], keep=False)
+    if duplicated.any():
+        raise ValueError(
+            f"{duplicated.sum()} store rows share an (ArticleID, criterion) pair "
+            f"for model={model!r}, rubric_version={rubric_version!r}"
+        )
+
+    wide = long.pivot(index="ArticleID", columns="criterion", values="score")
+    if criteria is not None:
+        wide = wide.reindex(columns=criteria)
+    wide.columns.name = None
+
+    return wide.astype("Int8")
+
+
+def attach_scores(
+    df: pd.DataFrame,
+    path,
+    criteria,
+    model: str,
+    rubric_version: str,
+    id_col: str = "ArticleID",
+) -> pd.DataFrame:
+    """
+    Override the rubric score columns of a merged_evaluations frame with
+    the store's scores for one model and rubric version, matched on
+    `id_col` (see read_scores_wide). Articles (or criteria) the store has
+    no score for keep the value already in `df`.
+    """
+    scores = read_scores_wide(path, model, rubric_version, criteria=criteria)
+    scores = scores.reindex(pd.to_numeric(df[id_col]).astype("int64"))
+    scores.index = df.index
+
+    df = df.copy()
+    for col in criteria:
+        existing = df[col] if col in df.columns else pd.Series(pd.NA, index=df.index)
+        existing = pd.to_numeric(existing, errors="coerce").astype("Int8")
+        df[col] = scores[col].combine_first(existing)
+
+    return df
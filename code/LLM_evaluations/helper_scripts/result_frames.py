@@ -0,0 +1,83 @@
+from typing import List, Dict
+
+import pandas as pd
+
+from rubric import LIST_RUBRIC
+
+
+CRITERIA = [r["criterion"] for r in LIST_RUBRIC]
+JUSTIFICATION_SUFFIX = " Justification"
+
+
+def results_to_long(results: List[Dict]) -> pd.DataFrame:
+    """
+    One row per (result id, rubric section) with the criterion label as
+    returned by the model (minus any ': description' tail).
+    """
+    rows = [
+        (
+            result["id"],
+            str(section.get("criterion", "")).split(":")[0].strip(),
+            section.get("score"),
+            section.get("justification"),
+        )
+        for result in results
+        if result["output"]
+        for section in result["output"].get("sections", [])
+    ]
+
+    return pd.DataFrame(rows, columns=["id", "criterion", "score", "justification"])
+
+
+def results_to_store_frame(results: List[Dict], model: str, rubric_version: str, dataset: str) -> pd.DataFrame:
+    """
+    Long-format rows for evaluation_store: one per (ArticleID, criterion)
+    for every schema-valid result, tagged with the article set
+    (see evaluation_store.DATASET_ID_OFFSETS).
+    """
+    batch_ids = {r["id"]: r.get("batch_id") for r in results}
+
+    long = results_to_long([r for r in results if r["validation_passed"]])
+    long = long[long["criterion"].isin(CRITERIA)]
+    long = long.drop_duplicates(subset=["id", "criterion"], keep="first")
+
+    return long.rename(columns={"id": "ArticleID"}).assign(
+        dataset=dataset,
+        model=model,
+        rubric_version=rubric_version,
+        batch_id=long["id"].map(batch_ids),
+    )
+
+
+def results_to_frame(results: List[Dict]) -> pd.DataFrame:
+    """
+    Flatten evaluation results into one row per id.
+
+    Columns:
+        - validation_passed / validation_reason
+        - one score column per rubric criterion
+        - one '<criterion> Justification' column per rubric criterion
+    """
+    meta = pd.DataFrame(
+        {
+            "validation_passed": [r["validation_passed"] for r in results],
+            "validation_reason": [r["validation_reason"] for r in results],
+        },
+        index=pd.Index([r["id"] for r in results], name="id"),
+    )
+    meta = meta[~meta.index.duplicated(keep="last")]
+
+    long = results_to_long(results)
+    long = long[long["criterion"].isin(CRITERIA)]
+    long = long.drop_duplicates(subset=["id", "criterion"], keep="first")
+
+    wide = long.pivot(index="id", columns="criterion", values=["score", "justification"])
+    wide = wide.reindex(columns=pd.MultiIndex.from_product([["score", "justification"], CRITERIA]))
+
+    scores = wide["score"]
+    scores = scores.apply(pd.to_numeric, errors="coerce").astype("Int64")
+
+    justifications = wide["justification"]
+    justifications.columns = [c + JUSTIFICATION_SUFFIX for c in CRITERIA]
+
+    return meta.join(scores).join(justifications)
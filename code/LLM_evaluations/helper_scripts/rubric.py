@@ -1,3 +1,5 @@
+import hashlib
+
 RUBRIC = {
     "id": [
         1,
@@ -88,3 +90,6 @@ def build_checklist(rubric_list):
 
 LIST_RUBRIC = dict_of_lists_to_list_of_dicts(RUBRIC)
 CHECKLIST_RUBRIC = build_checklist(LIST_RUBRIC)
+
+# Short content hash identifying this rubric text in stored evaluations
+RUBRIC_VERSION = hashlib.sha256(CHECKLIST_RUBRIC.encode("utf-8")).hexdigest()[:12]
@@ -1,41 +1,75 @@
-from config import MODEL
+from config import MODEL, REQUEST_LAYOUT
 from prompt import RUBRIC_OUTPUT_SCHEMA, SYSTEM_PROMPT
+import hashlib
 import json
 
-def make_messages(rubric_checklist, passage):
+def make_messages(rubric_checklist, passage, layout=REQUEST_LAYOUT):
     """
     Construct system and user messages for rubric-based evaluation.
+
+    With layout='shared_prefix' the system prompt and rubric form a fixed
+    leading message and the passage comes last, so every request shares the
+    same prefix. layout='json_payload' packs rubric and passage together
+    into a single JSON-encoded user message.
     """
-    user_payload = {
-        "rubric_checklist": rubric_checklist,
-        "passage": passage,
-    }
+    if layout == "shared_prefix":
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT + "\n# Rubric Checklist\n" + rubric_checklist},
+            {"role": "user", "content": json.dumps({"passage": passage})},
+        ]
+
+    if layout == "json_payload":
+        user_payload = {
+            "rubric_checklist": rubric_checklist,
+            "passage": passage,
+        }
+
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": json.dumps(user_payload)},
+        ]
 
-    return [
-        {"role": "system", "content": SYSTEM_PROMPT},
-        {"role": "user", "content": json.dumps(user_payload)},
-    ]
+    raise ValueError(f"Unknown request layout: {layout}")
+
+
+def prompt_cache_key(rubric_checklist):
+    """
+    Routing hint that sends requests sharing a prompt prefix to the same
+    cache.
+    """
+    prefix = MODEL + SYSTEM_PROMPT + rubric_checklist
+    return "rubric-" + hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:16]
 
 
-def make_single_request(rubric_checklist, passage, custom_id):
+def make_request_body(rubric_checklist, passage, layout=REQUEST_LAYOUT):
     """
-    Build a single Responses API request with JSON Schema–enforced output.
+    Build the Responses API request body with JSON Schema–enforced output.
     """
-    messages = make_messages(rubric_checklist, passage)
+    body = {
+        "model": MODEL,
+        "input": make_messages(rubric_checklist, passage, layout),
+        "text": {
+            "format": {
+                "type": "json_schema",
+                "name": "rubric_evaluation",
+                "schema": RUBRIC_OUTPUT_SCHEMA,
+            }
+        },
+    }
+
+    if layout == "shared_prefix":
+        body["prompt_cache_key"] = prompt_cache_key(rubric_checklist)
+
+    return body
 
+
+def make_single_request(rubric_checklist, passage, custom_id, layout=REQUEST_LAYOUT):
+    """
+    Build a single Responses API batch request with JSON Schema–enforced output.
+    """
     return {
         "custom_id": custom_id,
         "method": "POST",
         "url": "/v1/responses",
-        "body": {
-            "model": MODEL,
-            "input": messages,
-            "text": {
-                "format": {
-                    "type": "json_schema",
-                    "name": "rubric_evaluation",
-                    "schema": RUBRIC_OUTPUT_SCHEMA,
-                }
-            },
-        },
+        "body": make_request_body(rubric_checklist, passage, layout),
     }
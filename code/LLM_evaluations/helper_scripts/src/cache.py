@@ -0,0 +1,82 @@
+from config import MODEL, REQUEST_LAYOUT
+from prompt import RUBRIC_OUTPUT_SCHEMA, SYSTEM_PROMPT
+import hashlib
+import json
+import sqlite3
+
+
+def cache_key(
+    rubric_checklist,
+    passage,
+    model=MODEL,
+    system_prompt=SYSTEM_PROMPT,
+    schema=RUBRIC_OUTPUT_SCHEMA,
+    layout=REQUEST_LAYOUT,
+):
+    """
+    Content hash of everything that determines an evaluation: model, system
+    prompt, output schema, rubric, request layout and passage.
+    """
+    payload = json.dumps(
+        {
+            "model": model,
+            "layout": layout,
+            "system_prompt": system_prompt,
+            "schema": schema,
+            "rubric_checklist": rubric_checklist,
+            "passage": passage,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk SQLite store of schema-validated evaluation outputs keyed by
+    cache_key.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS evaluations ("
+            " key TEXT PRIMARY KEY,"
+            " output TEXT NOT NULL,"
+            " created_at TEXT DEFAULT CURRENT_TIMESTAMP)"
+        )
+        self.conn.commit()
+
+    def get_many(self, keys):
+        """
+        Return {key: output} for every key already in the cache.
+        """
+        found = {}
+        keys = list(set(keys))
+
+        # Stay well below SQLite's bound-parameter limit
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT key, output FROM evaluations WHERE key IN ({placeholders})",
+                chunk,
+            )
+            for key, output in rows:
+                found[key] = json.loads(output)
+
+        return found
+
+    def put_many(self, items):
+        """
+        Store (key, output) pairs, replacing any previous output for a key.
+        """
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO evaluations (key, output) VALUES (?, ?)",
+            [(key, json.dumps(output)) for key, output in items],
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -6,6 +6,11 @@ from dotenv import load_dotenv
 load_dotenv()
 
 MODEL = 'gpt-5'
+# 'json_payload' is the original layout with rubric and passage packed into
+# one user message. 'shared_prefix' keeps the system prompt and rubric as an
+# identical leading block across requests (eligible for prompt caching), but
+# changes what the model sees, so opt in only for a fresh evaluation run.
+REQUEST_LAYOUT = 'json_payload'
 API_KEY = os.getenv("OPENAI_API_KEY")
 TIMEOUT = 300
 
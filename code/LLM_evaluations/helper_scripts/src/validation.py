@@ -1,4 +1,82 @@
-def validate_schema(output):
+def build_rubric_validator(list_rubric, min_score=1, max_score=10):
+    """
+    Compile a validator for one rubric (rubric.LIST_RUBRIC).
+
+    The returned function takes a parsed model output and returns a list of
+    defects, each a dict with 'criterion' (None if not attributable) and
+    'problem'. An empty list means the output covers every criterion exactly
+    once with an integer score in range and a non-empty justification.
+    """
+    expected = [r["criterion"] for r in list_rubric]
+    expected_set = frozenset(expected)
+
+    def validate(output):
+        if not isinstance(output, dict):
+            return [{"criterion": None, "problem": "Output is not an object"}]
+
+        sections = output.get("sections")
+        if not isinstance(sections, list):
+            return [{"criterion": None, "problem": "'sections' is missing or not a list"}]
+
+        defects = []
+        if len(sections) != len(expected):
+            defects.append({
+                "criterion": None,
+                "problem": f"Expected {len(expected)} sections, got {len(sections)}",
+            })
+
+        seen = set()
+        for section in sections:
+            if not isinstance(section, dict):
+                defects.append({"criterion": None, "problem": "Section is not an object"})
+                continue
+
+            criterion = section.get("criterion")
+            if criterion not in expected_set:
+                defects.append({"criterion": criterion, "problem": "Unknown criterion name"})
+                continue
+
+            if criterion in seen:
+                defects.append({"criterion": criterion, "problem": "Duplicate criterion"})
+            seen.add(criterion)
+
+            score = section.get("score")
+            if not isinstance(score, int) or isinstance(score, bool):
+                defects.append({"criterion": criterion, "problem": f"Score is not an integer: {score!r}"})
+            elif not min_score <= score <= max_score:
+                defects.append({"criterion": criterion, "problem": f"Score out of range: {score}"})
+
+            justification = section.get("justification")
+            if not isinstance(justification, str) or not justification.strip():
+                defects.append({"criterion": criterion, "problem": "Empty justification"})
+
+        for criterion in expected:
+            if criterion not in seen:
+                defects.append({"criterion": criterion, "problem": "Missing criterion"})
+
+        return defects
+
+    return validate
+
+
+def validate_schema(output, validator=None):
+    """
+    Check a parsed model output. With a validator from
+    build_rubric_validator, every rubric defect is reported; without one,
+    only the top-level structure is checked.
+
+    Returns:
+        (bool, str): whether the output is valid, and 'OK' or the defects.
+    """
+    if validator is not None:
+        defects = validator(output)
+        if defects:
+            return False, "; ".join(
+                f"{d['criterion']}: {d['problem']}" if d["criterion"] else d["problem"]
+                for d in defects
+            )
+        return True, "OK"
+
     if not isinstance(output, dict):
         return False, "Output is not an object"
 
@@ -9,4 +87,3 @@ def validate_schema(output):
         return False, "'sections' is not a list"
 
     return True, "OK"
-
@@ -8,11 +8,21 @@ Outputs:
   outputs/tables/tex/Table-LLM-Summary.tex      — portrait summary table by gender group
 """
 
+import sys
 import pandas as pd
 from pathlib import Path
 
+from helper_scripts.evaluation_store import attach_scores
+from helper_scripts.rubric import RUBRIC_VERSION
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from merged_data import load_merged_evaluations
+
 ROOT      = Path(__file__).parents[2]
 DATA_PATH = ROOT / 'data/processed/llm_evaluated/clean_evaluations/merged_evaluations.csv'
+EVAL_STORE = ROOT / 'data/processed/llm_evaluated/evaluations.parquet'
+# Store scores are only used for this model and the current rubric text
+STORE_MODEL = 'gpt-5'
 CSV_DIR   = ROOT / 'outputs/tables/csv'
 TEX_DIR   = ROOT / 'outputs/tables/tex'
 
@@ -92,15 +102,20 @@ def fmt(mean, sd):
 
 
 # ── 1. Load & filter ──────────────────────────────────────────────────────────
-df_raw = pd.read_csv(DATA_PATH, low_memory=False)
+df_raw = load_merged_evaluations(['Journal', 'Language', 'Title', 'Female_authorship_ratio'] + LLM_COLS, path=DATA_PATH)
+# Prefer typed scores from the columnar evaluation store when it exists
+if EVAL_STORE.exists():
+    df_raw = attach_scores(df_raw, EVAL_STORE, LLM_COLS, STORE_MODEL, RUBRIC_VERSION)
 df_raw = df_raw[df_raw['Journal'].isin(JOURNALS)]
 df_raw = df_raw[df_raw['Language'] == 'English']
 mask = df_raw['Title'].str.lower().str.contains('|'.join(EXCL_PATTERNS), na=False)
 df_raw = df_raw[~mask]
+df_raw = df_raw.assign(Journal=df_raw['Journal'].cat.remove_unused_categories())
 print(f"Rows after journal/language/errata filter: {len(df_raw):,}")
 
 art = df_raw.drop_duplicates('ArticleID').copy()
-art[LLM_COLS] = art[LLM_COLS].apply(pd.to_numeric, errors='coerce')
+# float stats (NaN rather than pd.NA for single-article groups)
+art[LLM_COLS] = art[LLM_COLS].astype(float)
 print(f"Article-level (deduped):   {len(art):,}")
 
 print("\nJournal counts:")
@@ -1,12 +1,34 @@
 import pandas as pd
 
-from helper_scripts.batch_runner import batch_call_and_validate
-from helper_scripts.rubric import CHECKLIST_RUBRIC
-
-
+from helper_scripts.batch_orchestrator import run_batches
+from helper_scripts.async_runner import concurrent_call_and_validate
+from helper_scripts.result_frames import results_to_frame, results_to_store_frame
+from helper_scripts.evaluation_store import write_evaluation_store
+from helper_scripts.rubric import CHECKLIST_RUBRIC, RUBRIC_VERSION
+from helper_scripts.src.cache import ResultCache
+from helper_scripts.src.config import MODEL
+
+
+# 'batch' uses the 24h Batch API; 'concurrent' sends the same requests to the
+# regular Responses endpoint for quick, small re-scoring runs.
+MODE = "batch"
+CONCURRENCY = 8
 BATCH_SIZE = 1000
+POLL_INTERVAL = 60
 INPUT_CSV = "/Users/austincoffelt/Documents/Who_Writes_What/data/raw/hengel_replication_data/Article.csv"
 OUTPUT_CSV = "/Users/austincoffelt/Documents/Who_Writes_What/data/processed/llm_evaluated/raw_evaluations/hengel_QJE.csv"
+# Article set of INPUT_CSV in the evaluation store: 'hengel', or 'mgsc' for
+# the scraped Management Science results (their IDs overlap Hengel's)
+DATASET = "hengel"
+# Typed (article, criterion) rows shared by all runs; see evaluation_store.py
+EVAL_STORE = "/Users/austincoffelt/Documents/Who_Writes_What/data/processed/llm_evaluated/evaluations.parquet"
+# Batch progress is checkpointed here; rerunning after a crash re-attaches
+# to in-flight batches instead of resubmitting them.
+STATE_FILE = "/Users/austincoffelt/Documents/Who_Writes_What/data/processed/llm_evaluated/raw_evaluations/hengel_QJE_batches.json"
+WORK_DIR = "/Users/austincoffelt/Documents/Who_Writes_What/data/processed/llm_evaluated/raw_evaluations/hengel_QJE_batches"
+# Shared across runs: abstracts already scored under the same model, prompt,
+# schema and rubric are served from here instead of being resubmitted.
+CACHE_PATH = "/Users/austincoffelt/Documents/Who_Writes_What/data/processed/llm_evaluated/evaluation_cache.sqlite"
 
 
 def main():
@@ -23,35 +45,38 @@ def main():
     df["ArticleID"] = df["ArticleID"].astype(str)
 
     # ------------------------------------------------------------
-    # Run batch evaluations in chunks
+    # Run evaluations: batch chunks (submitted together, checkpointed)
+    # or concurrent synchronous requests
     # ------------------------------------------------------------
-    all_results = []
-
-    for start in range(0, len(df), BATCH_SIZE):
-        end = start + BATCH_SIZE
-
-        chunk = df.iloc[start:end]
-
-        passages = chunk["Abstract"].tolist()
-        custom_ids = chunk["ArticleID"].tolist()
-
-        chunk_results = batch_call_and_validate(
-            passages=passages,
-            custom_ids=custom_ids,
-            rubric_checklist=CHECKLIST_RUBRIC
+    cache = ResultCache(CACHE_PATH)
+
+    if MODE == "concurrent":
+        all_results = concurrent_call_and_validate(
+            passages=df["Abstract"].tolist(),
+            custom_ids=df["ArticleID"].tolist(),
+            rubric_checklist=CHECKLIST_RUBRIC,
+            concurrency=CONCURRENCY,
+            cache=cache,
         )
-
-        all_results.extend(chunk_results)
+    else:
+        all_results = run_batches(
+            passages=df["Abstract"].tolist(),
+            custom_ids=df["ArticleID"].tolist(),
+            rubric_checklist=CHECKLIST_RUBRIC,
+            state_file=STATE_FILE,
+            work_dir=WORK_DIR,
+            batch_size=BATCH_SIZE,
+            poll_interval=POLL_INTERVAL,
+            cache=cache,
+        )
+    cache.close()
 
     # ------------------------------------------------------------
-    # Attach structured results and persist
+    # Attach structured results (one indexed join on ArticleID) and persist
     # ------------------------------------------------------------
-    df['evaluations'] = None
+    df = df.join(results_to_frame(all_results), on="ArticleID")
 
-    for result in all_results:
-        row_index = df.index[df['ArticleID'] == result['id']]
-        if not row_index.empty:  # just in case there’s no match
-            df.at[row_index[0], 'evaluations'] = str(result['output'])
+    write_evaluation_store(results_to_store_frame(all_results, MODEL, RUBRIC_VERSION, DATASET), EVAL_STORE)
 
     df.to_csv(OUTPUT_CSV, index=False)
 
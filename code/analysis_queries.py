@@ -0,0 +1,101 @@
+"""
+Read helpers for the analysis store (see analysis_store.py).
+
+Each function selects only the requested columns and rows, using the
+store's key and Journal / criterion indexes, instead of loading a whole
+wide CSV.
+"""
+
+from typing import Iterable, Optional, Sequence
+
+import pandas as pd
+
+from analysis_store import STORE_DB, connect, quote_identifier
+
+
+def query(sql: str, params: Sequence = (), db_path: str = STORE_DB) -> pd.DataFrame:
+    conn = connect(db_path)
+    try:
+        return pd.read_sql_query(sql, conn, params=list(params))
+    finally:
+        conn.close()
+
+
+def _journal_filter(journals: Optional[Iterable[str]], alias: str = "ar"):
+    if journals is None:
+        return "", []
+    journals = list(journals)
+    return f" AND {alias}.Journal IN ({', '.join('?' * len(journals))})", journals
+
+
+def read_articles(
+    columns: Optional[Iterable[str]] = None,
+    journals: Optional[Iterable[str]] = None,
+    db_path: str = STORE_DB,
+) -> pd.DataFrame:
+    """
+    Article attributes indexed by ArticleID; all columns by default.
+    """
+    select = "ar.*" if columns is None else ", ".join(
+        f"ar.{quote_identifier(c)}" for c in ["ArticleID", *[c for c in columns if c != "ArticleID"]]
+    )
+    where, params = _journal_filter(journals)
+
+    df = query(f"SELECT {select} FROM articles ar WHERE 1=1{where}", params, db_path)
+    return df.set_index("ArticleID")
+
+
+def read_authorship(
+    author_columns: Iterable[str] = ("Author_name",),
+    article_columns: Iterable[str] = (),
+    journals: Optional[Iterable[str]] = None,
+    db_path: str = STORE_DB,
+) -> pd.DataFrame:
+    """
+    One row per author and article with the author's gender guess (Sex,
+    Sex_probability, gender_source) and the requested author and article
+    columns.
+    """
+    select = ["aa.ArticleID", "aa.author_key"]
+    select += [f"au.{quote_identifier(c)}" for c in author_columns]
+    select += ["g.Sex", "g.Sex_probability", "g.source AS gender_source"]
+    select += [f"ar.{quote_identifier(c)}" for c in article_columns]
+    where, params = _journal_filter(journals)
+
+    sql = (
+        f"SELECT {', '.join(select)} FROM author_articles aa "
+        "JOIN articles ar ON ar.ArticleID = aa.ArticleID "
+        "LEFT JOIN authors au ON au.author_key = aa.author_key "
+        "LEFT JOIN gender_guesses g ON g.author_key = aa.author_key "
+        f"WHERE 1=1{where} ORDER BY aa.ArticleID"
+    )
+    return query(sql, params, db_path)
+
+
+def read_scores(
+    criteria: Optional[Sequence[str]] = None,
+    journals: Optional[Iterable[str]] = None,
+    db_path: str = STORE_DB,
+) -> pd.DataFrame:
+    """
+    Rubric scores as one row per ArticleID and one Int8 column per
+    criterion (in `criteria` order if given).
+    """
+    where, params = _journal_filter(journals)
+    if criteria is not None:
+        where += f" AND e.criterion IN ({', '.join('?' * len(criteria))})"
+        params += list(criteria)
+
+    long = query(
+        "SELECT e.ArticleID, e.criterion, e.score FROM evaluations e "
+        f"JOIN articles ar ON ar.ArticleID = e.ArticleID WHERE 1=1{where}",
+        params,
+        db_path,
+    )
+
+    wide = long.pivot(index="ArticleID", columns="criterion", values="score")
+    if criteria is not None:
+        wide = wide.reindex(columns=list(criteria))
+    wide.columns.name = None
+
+    return wide.astype("Int8")
@@ -0,0 +1,250 @@
+"""
+Local SQLite store for the analysis data.
+
+Instead of handing wide CSVs from one merge step to the next, each step
+upserts what it produces into normalized tables:
+
+- articles:        one row per ArticleID (journal, title, abstract, dates,
+                   authorship indicators, ...)
+- authors:         one row per author_key (Hengel AuthorID, or article
+                   and author position for scraped authors)
+- author_articles: which authors wrote which article
+- evaluations:     one row per (ArticleID, criterion) rubric score
+- gender_guesses:  one row per author_key with Sex, Sex_probability, source
+
+Tables start with their key columns only; any other column a step writes
+is added on first use, so a step can attach new attributes without a
+schema change. Read the store through analysis_queries.py.
+"""
+
+import os
+import sqlite3
+from typing import Iterable, Optional
+
+import pandas as pd
+
+STORE_DB = '~/tonal_analysis/data/processed/analysis.db'
+
+CRITERIA = [
+    'Modal Verb Strength', 'Hedging Frequency & Type', 'Qualifier Density',
+    'Acknowledgement of Limitations', 'Caution-Signaling Connectors',
+    'Assertiveness & Voice', 'Active/Passive Voice Ratio',
+    'Sentence Length & Directness', 'Imperative-Form Occurrence',
+    'Pronoun Commitment', 'Novelty-Claim Strength', 'Jargon/Technicality Density',
+    'Emotional Valence', 'Evidence & Citation Usage',
+    'Practical/Impact Orientation', 'Readability'
+]
+
+# Canonical names for the Hengel columns (as in merged_evaluations.csv);
+# rename with these before writing Hengel data to the store
+HENGEL_COLUMNS = {
+    'PubDate': 'Publsh_date', 'Title_PBLSH': 'Title', 'Abstract_PBLSH': 'Abstract',
+    'evaluation_pblsh_parsed': 'Evaluation', 'AuthorName': 'Author_name',
+    'NativeLanguage': 'Native_language',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    ArticleID INTEGER PRIMARY KEY,
+    Journal TEXT
+);
+CREATE INDEX IF NOT EXISTS articles_journal ON articles (Journal);
+
+CREATE TABLE IF NOT EXISTS authors (
+    author_key TEXT PRIMARY KEY,
+    AuthorID INTEGER,
+    Author_name TEXT
+);
+
+CREATE TABLE IF NOT EXISTS author_articles (
+    ArticleID INTEGER NOT NULL,
+    author_key TEXT NOT NULL,
+    PRIMARY KEY (ArticleID, author_key)
+);
+CREATE INDEX IF NOT EXISTS author_articles_author ON author_articles (author_key);
+
+CREATE TABLE IF NOT EXISTS evaluations (
+    ArticleID INTEGER NOT NULL,
+    criterion TEXT NOT NULL,
+    score INTEGER,
+    PRIMARY KEY (ArticleID, criterion)
+);
+CREATE INDEX IF NOT EXISTS evaluations_criterion ON evaluations (criterion);
+
+CREATE TABLE IF NOT EXISTS gender_guesses (
+    author_key TEXT PRIMARY KEY,
+    Sex TEXT,
+    Sex_probability REAL,
+    source TEXT
+);
+"""
+
+KEYS = {
+    "articles": ["ArticleID"],
+    "authors": ["author_key"],
+    "author_articles": ["ArticleID", "author_key"],
+    "evaluations": ["ArticleID", "criterion"],
+    "gender_guesses": ["author_key"],
+}
+
+
+def connect(db_path: str = STORE_DB) -> sqlite3.Connection:
+    conn = sqlite3.connect(os.path.expanduser(db_path))
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sql_type(series: pd.Series) -> str:
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(series):
+        return "REAL"
+    return "TEXT"
+
+
+def _records(frame: pd.DataFrame):
+    """
+    Rows as plain Python values (None for missing, ISO strings for dates)
+    that sqlite3 can bind.
+    """
+    frame = frame.copy()
+    for col in frame.columns:
+        if pd.api.types.is_datetime64_any_dtype(frame[col]):
+            frame[col] = frame[col].dt.strftime("%Y-%m-%d")
+        elif pd.api.types.is_bool_dtype(frame[col]):
+            frame[col] = frame[col].astype("Int8")
+
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.itertuples(index=False, name=None)
+
+
+def upsert(db_path: str, table: str, frame: pd.DataFrame) -> int:
+    """
+    Insert the rows of `frame` into `table`, updating rows whose key
+    already exists. Only the columns in `frame` are overwritten; columns
+    the table does not have yet are added.
+
+    Returns:
+        int: number of rows written.
+    """
+    keys = KEYS[table]
+    frame = frame.drop_duplicates(subset=keys, keep="last")
+    columns = list(frame.columns)
+
+    conn = connect(db_path)
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    for col in columns:
+        if col not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {quote_identifier(col)} {_sql_type(frame[col])}")
+
+    updates = [c for c in columns if c not in keys]
+    conflict = (
+        "DO UPDATE SET " + ", ".join(f"{quote_identifier(c)} = excluded.{quote_identifier(c)}" for c in updates)
+        if updates else "DO NOTHING"
+    )
+    sql = (
+        f"INSERT INTO {table} ({', '.join(map(quote_identifier, columns))}) "
+        f"VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT({', '.join(map(quote_identifier, keys))}) {conflict}"
+    )
+
+    with conn:
+        conn.executemany(sql, _records(frame))
+    conn.close()
+
+    return len(frame)
+
+
+# -----------------------------
+# STEP WRITERS
+# -----------------------------
+def author_keys(
+    df: pd.DataFrame,
+    id_col: Optional[str] = "AuthorID",
+    position_col: str = "position",
+    article_col: str = "ArticleID",
+) -> pd.Series:
+    """
+    Store key per author row: 'id:<AuthorID>' for authors with a Hengel
+    AuthorID, otherwise 'paper:<ArticleID>_<position>'. Scraped authors
+    only have a name, and names are not unique, so each of their
+    author-article rows is its own author.
+    """
+    ids = None
+    if id_col is not None and id_col in df.columns:
+        ids = "id:" + pd.to_numeric(df[id_col], errors="coerce").astype("Int64").astype("string")
+
+    if position_col not in df.columns:
+        if ids is None or ids.isna().any():
+            raise ValueError(f"author rows without {id_col} need a {position_col} column")
+        return ids
+
+    papers = (
+        "paper:" + df[article_col].astype("Int64").astype("string")
+        + "_" + pd.to_numeric(df[position_col]).astype("Int64").astype("string")
+    )
+    return papers if ids is None else ids.fillna(papers)
+
+
+def store_articles(df: pd.DataFrame, columns: Iterable[str], db_path: str = STORE_DB) -> int:
+    """
+    Article attributes, taken from the first row of each ArticleID in an
+    article- or author-level frame.
+    """
+    columns = ["ArticleID"] + [c for c in columns if c != "ArticleID"]
+    articles = df[columns].drop_duplicates(subset="ArticleID", keep="first")
+    return upsert(db_path, "articles", articles)
+
+
+def store_authorship(
+    df: pd.DataFrame,
+    author_columns: Iterable[str] = (),
+    key_col: str = "author_key",
+    db_path: str = STORE_DB,
+) -> int:
+    """
+    Authors and author-article links from an author-level frame with an
+    author key column (see author_keys).
+    """
+    df = df[df[key_col].notna()]
+    authors = df[[key_col, *author_columns]].rename(columns={key_col: "author_key"})
+    upsert(db_path, "authors", authors)
+
+    links = df[["ArticleID", key_col]].rename(columns={key_col: "author_key"})
+    return upsert(db_path, "author_articles", links)
+
+
+def store_gender_guesses(
+    df: pd.DataFrame,
+    sex_col: str = "Sex",
+    prob_col: Optional[str] = "Sex_probability",
+    source_col: str = "gender_source",
+    key_col: str = "author_key",
+    db_path: str = STORE_DB,
+) -> int:
+    df = df[df[key_col].notna()]
+    guesses = pd.DataFrame({
+        "author_key": df[key_col],
+        "Sex": df[sex_col],
+        "Sex_probability": df[prob_col] if prob_col in df.columns else None,
+        "source": df[source_col] if source_col in df.columns else None,
+    })
+    return upsert(db_path, "gender_guesses", guesses)
+
+
+def store_evaluations(df: pd.DataFrame, criteria: Iterable[str] = CRITERIA, db_path: str = STORE_DB) -> int:
+    """
+    Rubric scores from a wide frame (one column per criterion), one row
+    per article and criterion. Missing or non-numeric scores are skipped.
+    """
+    criteria = [c for c in criteria if c in df.columns]
+    wide = df[["ArticleID", *criteria]].drop_duplicates(subset="ArticleID", keep="first")
+
+    long = wide.melt(id_vars="ArticleID", var_name="criterion", value_name="score")
+    long["score"] = pd.to_numeric(long["score"], errors="coerce").round().astype("Int64")
+
+    return upsert(db_path, "evaluations", long.dropna(subset=["score"]))
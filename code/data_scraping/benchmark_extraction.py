@@ -0,0 +1,74 @@
+"""
+Micro-benchmark for extraction.py on saved pages.
+
+Times extract_doi_info with every available parser backend against a
+plain full-tree html.parser parse, over either the HTML archive or a
+directory of .html fixture files:
+
+    python benchmark_extraction.py /path/to/html_archive
+    python benchmark_extraction.py /path/to/fixtures --limit 200
+"""
+
+import argparse
+import glob
+import os
+import time
+
+from bs4 import BeautifulSoup
+
+from extraction import extract_doi_info
+from html_archive import HtmlArchive, read_record
+
+
+def load_pages(path, limit=None):
+    html_files = sorted(glob.glob(os.path.join(path, "*.html")))
+    if html_files:
+        pages = []
+        for name in html_files[:limit]:
+            with open(name, "r", encoding="utf-8") as f:
+                pages.append(f.read())
+        return pages
+
+    paths = sorted(HtmlArchive(path).paths())[:limit]
+    return [read_record(p)["html"] for p in paths]
+
+
+def available_parsers():
+    parsers = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+        parsers.append("lxml")
+    except ImportError:
+        pass
+    return parsers
+
+
+def time_per_page(func, pages, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            func(page)
+        best = min(best, time.perf_counter() - start)
+    return best / len(pages) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="HTML archive root or directory of .html fixtures")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_pages(args.path, args.limit)
+    if not pages:
+        raise SystemExit(f"No pages found under {args.path}")
+
+    print(f"{len(pages)} pages, {sum(map(len, pages)) / len(pages) / 1024:.0f} KiB on average")
+
+    baseline = time_per_page(lambda p: BeautifulSoup(p, "html.parser"), pages, args.repeat)
+    print(f"{'full tree, html.parser':<28}{baseline:8.2f} ms/page")
+
+    for name in available_parsers():
+        ms = time_per_page(lambda p: extract_doi_info(p, parser=name), pages, args.repeat)
+        print(f"{'extract_doi_info, ' + name:<28}{ms:8.2f} ms/page  ({baseline / ms:.1f}x)")
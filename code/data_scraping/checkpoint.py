@@ -0,0 +1,90 @@
+"""
+Append-only JSONL checkpoint for long scrapes.
+
+Every finished DOI is appended (and fsynced) as one JSON line, so a crash
+loses at most the page in flight. On restart, load_checkpoint() returns the
+latest record per DOI: successful ones are skipped, errored ones re-queued.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict
+
+
+def load_checkpoint(path: str) -> Dict[str, dict]:
+    """
+    Latest record per DOI link from a checkpoint file (empty if missing).
+    A truncated last line from a crash mid-write is ignored.
+    """
+    records = {}
+
+    if not os.path.exists(path):
+        return records
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[record["link"]] = record
+
+    return records
+
+
+def completed_links(records: Dict[str, dict]) -> Dict[str, dict]:
+    """
+    Records whose last attempt succeeded.
+    """
+    return {link: r for link, r in records.items() if r.get("scrape_error") is None}
+
+
+class Checkpoint:
+    """
+    Thread-safe appender for scrape results.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._file = open(path, "a", encoding="utf-8")
+
+        # Terminate a line left half-written by a crash so the next record
+        # starts on its own line
+        if self._file.tell() > 0:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+
+    def append(self, link: str, info: dict) -> None:
+        record = {
+            "link": link,
+            "abstract": info.get("abstract"),
+            "acceptance_info": info.get("acceptance_info"),
+            "scrape_error": info.get("error"),
+            "fetch_tier": info.get("fetch_tier"),
+            "scraped_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
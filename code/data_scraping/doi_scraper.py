@@ -6,20 +6,32 @@ Scrapes:
 - Acceptance / editorial information (if present)
 
 Strategy:
-- One fresh Selenium browser per DOI
+- Plain HTTP first; a browser only when the static HTML has no abstract
+  or is a bot check
+- A small pool of long-lived Selenium browsers, recycled after a fixed
+  number of pages or as soon as a page looks blocked
+- Cookies and storage cleared between pages
+- Optional archive of raw HTML for offline re-parsing
+- Parallel workers, with requests to each publisher host spaced out
 - Minimal, reliable DOM parsing
 - Publisher-agnostic with INFORMS support
 
 Requirements:
-    pip install pandas selenium beautifulsoup4 webdriver-manager
+    pip install pandas requests selenium beautifulsoup4 webdriver-manager
 """
 
 import time
+import queue
 import random
-from typing import Optional, Dict
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Optional, Dict
+from urllib.parse import urlparse
 
 import pandas as pd
-from bs4 import BeautifulSoup
+import requests
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -30,9 +42,28 @@ from selenium.webdriver.support import expected_conditions as EC
 
 from webdriver_manager.chrome import ChromeDriverManager
 
+from checkpoint import Checkpoint, completed_links, load_checkpoint
+from extraction import extract_doi_info, needs_js
+from html_archive import HtmlArchive
+
 CHROMELABS_ERROR = "googlechromelabs.github.io"
 MAX_RETRIES = 2
 PAUSE_SECONDS = 60
+PAGES_PER_DRIVER = 25
+JITTER = (0.8, 1.4)
+HTTP_TIMEOUT = 20
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+HTTP_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+_thread_state = threading.local()
 
 
 def should_pause_and_retry(error: str) -> bool:
@@ -43,16 +74,22 @@ def clean_doi_link(raw: str) -> str:
     Normalize DOI links by removing trailing whitespace and
     accidental appended text (e.g., 'Abstract').
     """
-    if not isinstance(raw, str):
+    if not isinstance(raw, str) or not raw.strip():
         return raw
 
     # Keep only the first line, strip whitespace
     return raw.strip().splitlines()[0]
 
+@lru_cache(maxsize=1)
+def chromedriver_path() -> str:
+    """
+    Resolve (and download if needed) chromedriver once per process.
+    """
+    return ChromeDriverManager().install()
+
 def create_driver() -> webdriver.Chrome:
     """
-    Create a fresh, headless Chrome WebDriver instance.
-    A new browser is required for each DOI to avoid session-based blocking.
+    Create a headless Chrome WebDriver instance.
     """
 
     options = Options()
@@ -62,12 +99,9 @@ def create_driver() -> webdriver.Chrome:
     options.add_argument("--disable-blink-features=AutomationControlled")
 
     # Stable, realistic UA
-    options.add_argument(
-        "user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    )
+    options.add_argument(f"user-agent={USER_AGENT}")
 
-    service = Service(ChromeDriverManager().install())
+    service = Service(chromedriver_path())
     driver = webdriver.Chrome(service=service, options=options)
 
     # Remove webdriver fingerprint
@@ -77,21 +111,129 @@ def create_driver() -> webdriver.Chrome:
 
     return driver
 
-def scrape_doi_info(doi_url: str, verbose: bool = False) -> Dict[str, Optional[str]]:
+def reset_session(driver: webdriver.Chrome) -> None:
+    """
+    Clear cookies and site storage for every origin so the next page
+    starts from a clean session in the same browser.
+    """
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    driver.execute_cdp_cmd(
+        "Storage.clearDataForOrigin", {"origin": "*", "storageTypes": "all"}
+    )
+    driver.get("about:blank")
+
+class DriverPool:
     """
-    Scrape abstract and acceptance information from a single DOI page.
+    Up to `size` long-lived Chrome drivers shared between callers.
+
+    Drivers are started lazily, have their session reset between pages and
+    are replaced after `pages_per_driver` pages, or straight away when the
+    caller releases them with recycle=True (errors, blocked pages).
+    Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        pages_per_driver: int = PAGES_PER_DRIVER,
+        factory=create_driver,
+    ):
+        self.pages_per_driver = pages_per_driver
+        self.factory = factory
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.Queue()
+        self._pages = {}
+
+    def acquire(self) -> webdriver.Chrome:
+        """
+        Check out a driver, starting a new browser if none is idle.
+        Blocks while all `size` drivers are in use.
+        """
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        try:
+            driver = self.factory()
+        except Exception:
+            self._slots.release()
+            raise
+
+        self._pages[driver] = 0
+        return driver
+
+    def release(self, driver: webdriver.Chrome, recycle: bool = False) -> None:
+        """
+        Return a driver after one page. Recycled drivers are quit.
+        """
+        try:
+            self._pages[driver] += 1
+            if recycle or self._pages[driver] >= self.pages_per_driver:
+                self._discard(driver)
+                return
+
+            try:
+                reset_session(driver)
+            except Exception:
+                self._discard(driver)
+                return
+
+            self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    def _discard(self, driver: webdriver.Chrome) -> None:
+        self._pages.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """
+        Quit every idle driver.
+        """
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def scrape_doi_info(
+    doi_url: str,
+    verbose: bool = False,
+    driver: Optional[webdriver.Chrome] = None,
+) -> Dict[str, Optional[str]]:
+    """
+    Scrape abstract and acceptance information from a single DOI page
+    in a browser.
+
+    Uses `driver` if given (the caller owns it); otherwise starts and quits
+    a browser just for this page.
     """
 
     result = {
         "abstract": None,
         "acceptance_info": None,
         "error": None,
+        "blocked": False,
     }
 
-    driver = None
+    owns_driver = driver is None
 
     try:
-        driver = create_driver()
+        if owns_driver:
+            driver = create_driver()
 
         if verbose:
             print(f"Loading {doi_url}")
@@ -108,73 +250,20 @@ def scrape_doi_info(doi_url: str, verbose: bool = False) -> Dict[str, Optional[s
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight / 2);")
         time.sleep(random.uniform(1.0, 2.0))
 
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-
-        # -----------------------------
-        # ABSTRACT EXTRACTION
-        # -----------------------------
-        abstract = None
-
-        # INFORMS-specific (primary)
-        abstract_div = soup.find("div", class_="abstractSection")
-        if abstract_div:
-            paragraphs = abstract_div.find_all("p", recursive=False)
-            if paragraphs:
-                abstract = " ".join(p.get_text(strip=True) for p in paragraphs)
-
-        # Generic fallback
-        if not abstract:
-            meta = soup.find("meta", attrs={"name": "dc.description"})
-            if meta and meta.get("content"):
-                abstract = meta["content"].strip()
-
-        if abstract:
-            abstract = " ".join(abstract.split())
-            if len(abstract) > 3000:
-                abstract = abstract[:3000] + "..."
-
-        result["abstract"] = abstract
-
-        # -----------------------------
-        # ACCEPTANCE INFORMATION
-        # -----------------------------
-        acceptance_keywords = [
-            "accepted by",
-        ]
-
-        acceptance_info = None
-
-        # INFORMS places acceptance text near abstract
-        if abstract_div:
-            for sibling in abstract_div.find_next_siblings(limit=6):
-                text = sibling.get_text(strip=True)
-                if (
-                    30 < len(text) < 500
-                    and any(k in text.lower() for k in acceptance_keywords)
-                ):
-                    acceptance_info = text
-                    break
-
-        # Global fallback
-        if not acceptance_info:
-            for p in soup.find_all("p"):
-                text = p.get_text(strip=True)
-                if (
-                    30 < len(text) < 500
-                    and any(k in text.lower() for k in acceptance_keywords)
-                ):
-                    acceptance_info = text
-                    break
-
-        if acceptance_info:
-            acceptance_info = " ".join(acceptance_info.split())
-
-        result["acceptance_info"] = acceptance_info
+        result["html"] = driver.page_source
+        result["final_url"] = driver.current_url
+        result.update(extract_doi_info(result["html"], url=result["final_url"]))
+
+        if result["blocked"]:
+            result["error"] = f"Blocked page at {driver.current_url}"
+            if verbose:
+                print(f"✗ {result['error']}")
+            return result
 
         if verbose:
             print(
-                f"✓ Abstract: {len(abstract) if abstract else 0} chars | "
-                f"Acceptance: {'Yes' if acceptance_info else 'No'}"
+                f"✓ Abstract: {len(result['abstract'] or '')} chars | "
+                f"Acceptance: {'Yes' if result['acceptance_info'] else 'No'}"
             )
 
     except Exception as e:
@@ -183,62 +272,324 @@ def scrape_doi_info(doi_url: str, verbose: bool = False) -> Dict[str, Optional[s
             print(f"✗ Error: {e}")
 
     finally:
-        if driver:
+        if owns_driver and driver:
             driver.quit()
 
     return result
 
+def scrape_with_pool(pool: DriverPool, doi_url: str, verbose: bool = False) -> Dict[str, Optional[str]]:
+    """
+    Scrape one DOI on a pooled driver, recycling the driver if the page
+    errored or was blocked.
+    """
+    try:
+        driver = pool.acquire()
+    except Exception as e:
+        return {"abstract": None, "acceptance_info": None, "error": str(e), "blocked": False}
+
+    info = scrape_doi_info(doi_url, verbose=verbose, driver=driver)
+    info["fetch_tier"] = "browser"
+    pool.release(driver, recycle=info["error"] is not None)
+
+    return info
+
+def http_session() -> requests.Session:
+    """
+    Per-thread keep-alive session with the same browser user agent.
+    """
+    session = getattr(_thread_state, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(HTTP_HEADERS)
+        _thread_state.session = session
+    return session
+
+def fetch_static(doi_url: str) -> Dict[str, Optional[str]]:
+    """
+    Fetch and parse a DOI page over plain HTTP, without running any
+    JavaScript. `error` is set on HTTP errors and when the page has no
+    abstract or is a bot check, i.e. whenever a browser should retry it.
+    """
+    result = {
+        "abstract": None,
+        "acceptance_info": None,
+        "error": None,
+        "blocked": False,
+    }
+
+    try:
+        response = http_session().get(doi_url, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        result["error"] = str(e)
+        return result
+
+    result["html"] = response.text
+    result["final_url"] = response.url
+    result.update(extract_doi_info(result["html"], url=result["final_url"]))
+
+    if result["blocked"]:
+        result["error"] = f"Blocked page at {response.url}"
+    elif not result["abstract"]:
+        result["error"] = f"No abstract in static HTML at {response.url}"
+
+    return result
+
+def fetch_tiered(
+    doi_url: str,
+    pool: DriverPool,
+    verbose: bool = False,
+    scheduler: Optional["HostScheduler"] = None,
+) -> Dict[str, Optional[str]]:
+    """
+    Try the plain-HTTP tier first and fall back to a pooled browser only
+    if it fails. Hosts whose extractor declares needs_js go straight to
+    the browser. `fetch_tier` records which tier produced the result.
+
+    The browser fallback is a second request to the same host, so with a
+    scheduler it waits for the host's next slot first.
+    """
+    if needs_js(doi_url):
+        return scrape_with_pool(pool, doi_url, verbose=verbose)
+
+    info = fetch_static(doi_url)
+    if info["error"] is None:
+        info["fetch_tier"] = "http"
+        if verbose:
+            print(f"✓ {doi_url} via HTTP")
+        return info
+
+    if verbose:
+        print(f"… {info['error']}, falling back to browser")
+
+    if scheduler is not None:
+        time.sleep(scheduler.reserve(host_key(doi_url)))
+
+    return scrape_with_pool(pool, doi_url, verbose=verbose)
+
+def host_key(url: str) -> str:
+    """
+    Politeness key for a link: its host, or for doi.org links the DOI
+    registrant prefix (e.g. 10.1287 for INFORMS), which identifies the
+    publisher before the redirect is followed. Missing links share the
+    "invalid" key.
+    """
+    if not isinstance(url, str):
+        return "invalid"
+
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+
+    if host.endswith("doi.org"):
+        prefix = parsed.path.lstrip("/").split("/")[0]
+        return f"doi:{prefix}"
+
+    return host
+
+
+class HostScheduler:
+    """
+    Hands out (row, url) work items so that each host gets at most one
+    request per `delay * uniform(*jitter)` seconds, while items for
+    different hosts are released in parallel.
+    """
+
+    def __init__(self, items, delay: float = 3.0, jitter=JITTER):
+        self.delay = delay
+        self.jitter = jitter
+        self._queues = defaultdict(deque)
+        self._next = {}
+        self._lock = threading.Lock()
+
+        for i, url in items:
+            self._queues[host_key(url)].append((i, url))
+
+    def _reserve(self, host: str) -> float:
+        now = time.monotonic()
+        start = max(now, self._next.get(host, now))
+        self._next[host] = start + self.delay * random.uniform(*self.jitter)
+        return start - now
+
+    def reserve(self, host: str) -> float:
+        """
+        Book the next slot for `host`; returns the seconds to wait for it.
+        """
+        with self._lock:
+            return self._reserve(host)
+
+    def next_item(self):
+        """
+        Pop an item from the host whose next slot is earliest.
+
+        Returns:
+            (row, url, host, wait_seconds), or None when all queues are empty.
+        """
+        with self._lock:
+            pending = [h for h, q in self._queues.items() if q]
+            if not pending:
+                return None
+
+            host = min(pending, key=lambda h: self._next.get(h, 0.0))
+            i, url = self._queues[host].popleft()
+            return i, url, host, self._reserve(host)
+
+
+def scrape_with_retries(
+    doi: str,
+    host: str,
+    fetch: Callable[[str], Dict[str, Optional[str]]],
+    scheduler: HostScheduler,
+) -> Dict[str, Optional[str]]:
+    """
+    Fetch one DOI, retrying blocked pages (in the host's next slot) and
+    Chromedriver resolution errors (after a pause).
+    """
+    attempt = 0
+
+    while True:
+        info = fetch(doi)
+
+        # Successful run, or non-retryable / final failure
+        if info["error"] is None or attempt >= MAX_RETRIES:
+            return info
+
+        attempt += 1
+
+        if should_pause_and_retry(info["error"]):
+            print(
+                f"⚠ Chromedriver resolution error detected. "
+                f"Pausing {PAUSE_SECONDS}s before retry "
+                f"({attempt}/{MAX_RETRIES})..."
+            )
+            chromedriver_path.cache_clear()
+            time.sleep(PAUSE_SECONDS)
+        elif info.get("blocked"):
+            print(f"⚠ Blocked on {doi}, retrying on a fresh browser ({attempt}/{MAX_RETRIES})...")
+        else:
+            return info
+
+        time.sleep(scheduler.reserve(host))
+
+
 def scrape_multiple_dois(
     df: pd.DataFrame,
     link_column: str = "link",
     delay: float = 3.0,
     verbose: bool = True,
+    workers: int = 1,
+    pages_per_driver: int = PAGES_PER_DRIVER,
+    use_http: bool = True,
+    fetch: Optional[Callable[[str], Dict[str, Optional[str]]]] = None,
+    checkpoint_path: Optional[str] = None,
+    archive_dir: Optional[str] = None,
 ) -> pd.DataFrame:
     """
     Scrape abstracts and acceptance info for all DOIs in a DataFrame.
-    Uses a fresh browser session per DOI.
-    Retries DOI after pause if Chromedriver resolution fails.
-    """
 
-    df_out = df.copy()
-    df_out["abstract"] = None
-    df_out["acceptance_info"] = None
-    df_out["scrape_error"] = None
-
-    for i, row in df_out.iterrows():
-        doi = clean_doi_link(row[link_column])
-        print(f"\n[{i + 1}/{len(df_out)}] {doi}")
+    `workers` threads run in parallel, each on its own pooled browser. A
+    HostScheduler spaces requests to the same publisher by `delay` (with
+    jitter), so only DOIs on different hosts overlap. Blocked pages are
+    retried on a fresh browser, and Chromedriver resolution failures after
+    a pause.
 
-        attempt = 0
+    With use_http, each DOI is first fetched over plain HTTP and only
+    opened in a browser if that fails; `fetch_tier` records which was used.
 
-        while attempt <= MAX_RETRIES:
-            info = scrape_doi_info(doi, verbose=verbose)
+    `fetch(url)` replaces the browser fetch, e.g. to run against fixture
+    pages; it must return the same dict as scrape_doi_info.
 
-            # Successful Run
-            if info["error"] is None:
-                df_out.at[i, "abstract"] = info["abstract"]
-                df_out.at[i, "acceptance_info"] = info["acceptance_info"]
-                df_out.at[i, "scrape_error"] = None
-                break
+    With checkpoint_path, every finished DOI is appended to that JSONL
+    file as it completes. DOIs already scraped successfully there are
+    filled in from it and skipped; previously errored ones are retried.
 
-            # Unsuccessful Run
-            attempt += 1
+    With archive_dir, the HTML of every successfully fetched page is kept
+    in an HtmlArchive for offline re-parsing (see reparse_archive.py).
+    """
 
-            if should_pause_and_retry(info["error"]) and attempt <= MAX_RETRIES:
-                print(
-                    f"⚠ Chromedriver resolution error detected. "
-                    f"Pausing {PAUSE_SECONDS}s before retry "
-                    f"({attempt}/{MAX_RETRIES})..."
-                )
-                time.sleep(PAUSE_SECONDS)
-                continue
+    df_out = df.copy()
+    df_out["abstract"] = None
+    df_out["acceptance_info"] = None
+    df_out["scrape_error"] = None
+    df_out["fetch_tier"] = None
 
-            # Non-retryable or final failure
-            print(f"✗ Error: {info['error']}")
-            df_out.at[i, "scrape_error"] = info["error"]
-            break
+    items = [(i, clean_doi_link(link)) for i, link in df_out[link_column].items()]
 
-        if i < len(df_out) - 1:
-            time.sleep(delay * random.uniform(0.8, 1.4))
+    # A missing link only fails its own row, as a failed scrape would
+    results = {
+        i: {"abstract": None, "acceptance_info": None, "error": "Missing DOI link", "fetch_tier": None}
+        for i, doi in items
+        if not isinstance(doi, str) or not doi.strip()
+    }
+    items = [(i, doi) for i, doi in items if i not in results]
+
+    checkpoint = None
+    if checkpoint_path:
+        done = completed_links(load_checkpoint(checkpoint_path))
+        for i, doi in items:
+            if doi in done:
+                record = done[doi]
+                results[i] = {
+                    "abstract": record["abstract"],
+                    "acceptance_info": record["acceptance_info"],
+                    "error": None,
+                    "fetch_tier": record.get("fetch_tier"),
+                }
+        remaining = [(i, doi) for i, doi in items if i not in results]
+        print(f"Checkpoint: {len(items) - len(remaining)} DOIs already scraped, {len(remaining)} to go")
+        items = remaining
+        checkpoint = Checkpoint(checkpoint_path)
+
+    scheduler = HostScheduler(items, delay=delay)
+    archive = HtmlArchive(archive_dir) if archive_dir else None
+
+    pool = None
+    if fetch is None:
+        pool = DriverPool(size=workers, pages_per_driver=pages_per_driver)
+        if use_http:
+            fetch = lambda url: fetch_tiered(url, pool, verbose=verbose, scheduler=scheduler)
+        else:
+            fetch = lambda url: scrape_with_pool(pool, url, verbose=verbose)
+
+    progress = {"done": 0}
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            item = scheduler.next_item()
+            if item is None:
+                return
+
+            i, doi, host, wait = item
+            time.sleep(wait)
+            info = scrape_with_retries(doi, host, fetch, scheduler)
+
+            html = info.pop("html", None)
+            if archive is not None and html and info["error"] is None:
+                archive.put(doi, html, info.get("final_url"))
+
+            if checkpoint is not None:
+                checkpoint.append(doi, info)
+
+            with lock:
+                results[i] = info
+                progress["done"] += 1
+                status = "✓" if info["error"] is None else f"✗ Error: {info['error']}"
+                print(f"[{progress['done']}/{len(items)}] {doi} {status}")
 
-    return df_out
\ No newline at end of file
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(worker) for _ in range(workers)]:
+                future.result()
+    finally:
+        if pool is not None:
+            pool.close()
+        if checkpoint is not None:
+            checkpoint.close()
+
+    for i, info in results.items():
+        df_out.at[i, "abstract"] = info["abstract"]
+        df_out.at[i, "acceptance_info"] = info["acceptance_info"]
+        df_out.at[i, "scrape_error"] = info["error"]
+        df_out.at[i, "fetch_tier"] = info.get("fetch_tier")
+
+    return df_out
@@ -0,0 +1,332 @@
+"""
+Page parsing for DOI landing pages.
+
+Kept free of Selenium and network code so the same extraction runs on
+live pages and, offline, on pages saved in the HTML archive.
+
+Extraction is dispatched on the page's final URL host (or, for doi.org
+links, the DOI registrant prefix) to a publisher extractor from
+EXTRACTORS. Each one declares the DOM regions it needs, so only those
+are parsed, and whether the host needs JavaScript rendering. Pages from
+unknown hosts, and pages where a publisher extractor finds no abstract,
+go through the generic path.
+
+Parsing uses lxml when it is installed (several times faster than the
+built-in html.parser). The generic path only builds a tree of the page
+body for pages with an Atypon abstractSection (INFORMS passes its
+regions, so head scripts, styles and navigation are skipped); other
+pages are parsed through SoupStrainers for their meta tags and, if the
+raw HTML mentions "accepted by" at all, their paragraphs.
+"""
+
+import re
+from typing import Optional, Dict, Tuple
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+# Title / page-source fragments of bot-check and access-denied pages
+BLOCK_TITLES = ("just a moment", "attention required", "access denied", "are you a robot")
+BLOCK_MARKERS = ("cf-chl", "captcha-delivery", "px-captcha", "unusual traffic from your")
+
+TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+ACCEPTANCE_RE = re.compile(r"accepted by", re.IGNORECASE)
+
+META_NAMES = ("dc.description", "citation_abstract")
+META_STRAINER = SoupStrainer("meta", attrs={"name": list(META_NAMES)})
+PARAGRAPH_STRAINER = SoupStrainer("p")
+
+
+def make_soup(page_source: str, parser: str = PARSER, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Parse HTML with the configured backend, optionally only the parts
+    matched by a SoupStrainer.
+    """
+    return BeautifulSoup(page_source, parser, parse_only=parse_only)
+
+
+def is_blocked(page_source: str) -> bool:
+    """
+    Detect bot-check / access-denied interstitials from the raw HTML.
+    """
+    match = TITLE_RE.search(page_source)
+    title = match.group(1).lower() if match else ""
+    if any(t in title for t in BLOCK_TITLES):
+        return True
+
+    source = page_source.lower()
+    return any(m in source for m in BLOCK_MARKERS)
+
+
+def find_acceptance(elements) -> Optional[str]:
+    """
+    Text of the first element that reads like an acceptance note.
+    """
+    for element in elements:
+        text = element.get_text(strip=True)
+        if 30 < len(text) < 500 and ACCEPTANCE_RE.search(text):
+            return text
+    return None
+
+
+def clean_abstract(abstract: Optional[str]) -> Optional[str]:
+    """
+    Collapse whitespace and cap the abstract at 3,000 characters.
+    """
+    if not abstract:
+        return None
+
+    abstract = " ".join(abstract.split())
+    if len(abstract) > 3000:
+        abstract = abstract[:3000] + "..."
+    return abstract
+
+
+def meta_abstract(soup: BeautifulSoup, names=META_NAMES) -> Optional[str]:
+    """
+    First non-empty abstract-like <meta> tag, in `names` order.
+    """
+    for name in names:
+        meta = soup.find("meta", attrs={"name": name})
+        if meta and meta.get("content"):
+            return meta["content"].strip()
+    return None
+
+
+def extract_generic(
+    page_source: str,
+    parser: str = PARSER,
+    regions: Optional[Tuple[str, ...]] = None,
+) -> Dict[str, Optional[str]]:
+    """
+    Publisher-agnostic extraction: an Atypon abstractSection (INFORMS,
+    Chicago, ...) with the acceptance note among its siblings, else the
+    abstract meta tags and the first paragraph that reads like an
+    acceptance note.
+
+    `regions` limits the abstractSection tree to those tags (plus meta
+    and p); they must include the tags enclosing the abstract and its
+    siblings, or the sibling search sees the wrong neighbours.
+    """
+    # Neither regex nor substring checks can miss a match the DOM search
+    # would find, so they decide which parts of the page get parsed
+    has_acceptance = ACCEPTANCE_RE.search(page_source) is not None
+
+    if "abstractSection" in page_source:
+        # Acceptance notes are siblings of the abstract, so build the tree
+        # of every region that can hold them
+        strainer = SoupStrainer(list(regions) + ["meta", "p"]) if regions else None
+        soup = make_soup(page_source, parser, strainer)
+        abstract_div = soup.find("div", class_="abstractSection")
+    else:
+        soup = None
+        abstract_div = None
+
+    # -----------------------------
+    # ABSTRACT EXTRACTION
+    # -----------------------------
+    abstract = None
+
+    if abstract_div:
+        paragraphs = abstract_div.find_all("p", recursive=False)
+        if paragraphs:
+            abstract = " ".join(p.get_text(strip=True) for p in paragraphs)
+
+    # Generic fallback
+    if not abstract:
+        meta_soup = soup if soup is not None else make_soup(page_source, parser, META_STRAINER)
+        abstract = meta_abstract(meta_soup)
+
+    # -----------------------------
+    # ACCEPTANCE INFORMATION
+    # -----------------------------
+    acceptance_info = None
+
+    if has_acceptance:
+        # INFORMS places acceptance text near abstract
+        if abstract_div:
+            acceptance_info = find_acceptance(abstract_div.find_next_siblings(limit=6))
+
+        # Global fallback
+        if not acceptance_info:
+            p_soup = soup if soup is not None else make_soup(page_source, parser, PARAGRAPH_STRAINER)
+            acceptance_info = find_acceptance(p_soup.find_all("p"))
+
+    return {"abstract": abstract, "acceptance_info": acceptance_info}
+
+
+def extract_region(extractor: Dict, page_source: str, parser: str = PARSER) -> Dict[str, Optional[str]]:
+    """
+    Extraction driven by a registry entry: parse only the entry's
+    `regions` tags, take the abstract from the `abstract` CSS selector
+    (its paragraphs, or its text if it has none) or the meta tags, and
+    look for an acceptance note inside the abstract's parent only.
+    """
+    soup = make_soup(page_source, parser, SoupStrainer(list(extractor["regions"]) + ["meta"]))
+
+    abstract = None
+    acceptance_info = None
+
+    node = soup.select_one(extractor["abstract"])
+    if node is not None:
+        paragraphs = node.find_all("p")
+        if paragraphs:
+            abstract = " ".join(p.get_text(strip=True) for p in paragraphs)
+        else:
+            abstract = node.get_text(" ", strip=True)
+
+        if node.parent is not None and ACCEPTANCE_RE.search(page_source):
+            acceptance_info = find_acceptance(node.parent.find_all(["p", "div"], recursive=False))
+
+    if not abstract:
+        abstract = meta_abstract(soup)
+
+    return {"abstract": abstract, "acceptance_info": acceptance_info}
+
+
+# Publisher extractors, matched on the final URL host or, before the DOI
+# has been resolved, its registrant prefix. `needs_js` hosts are sent
+# straight to the browser tier. Entries without an `extract` function
+# use extract_region with their `regions` / `abstract` selector; an
+# `extract` function is called with the entry's `regions` (or None).
+EXTRACTORS = [
+    {
+        "name": "informs",
+        "hosts": ("pubsonline.informs.org",),
+        "doi_prefixes": ("10.1287",),
+        "needs_js": False,
+        "extract": extract_generic,
+        # Atypon wraps the abstract and its acceptance note in these
+        "regions": ("div", "section", "article"),
+    },
+    {
+        "name": "oup",
+        "hosts": ("academic.oup.com",),
+        "doi_prefixes": ("10.1093",),
+        "needs_js": False,
+        "regions": ("section",),
+        "abstract": "section.abstract",
+    },
+    {
+        "name": "wiley",
+        "hosts": ("onlinelibrary.wiley.com",),
+        "doi_prefixes": ("10.1111", "10.1002"),
+        "needs_js": False,
+        "regions": ("section",),
+        "abstract": "section.article-section__abstract .article-section__content",
+    },
+    {
+        "name": "elsevier",
+        "hosts": ("www.sciencedirect.com", "sciencedirect.com"),
+        "doi_prefixes": ("10.1016",),
+        "needs_js": True,
+        "regions": ("div",),
+        "abstract": "div.abstract.author",
+    },
+    {
+        "name": "jstor",
+        "hosts": ("www.jstor.org", "jstor.org"),
+        "doi_prefixes": ("10.2307",),
+        "needs_js": True,
+        "regions": ("div",),
+        "abstract": "div.abstract",
+    },
+    {
+        # Econometrica DOIs (10.3982) resolve to Wiley; this covers the
+        # society's own article pages
+        "name": "econometric_society",
+        "hosts": ("www.econometricsociety.org", "econometricsociety.org"),
+        "doi_prefixes": (),
+        "needs_js": False,
+        "regions": ("div", "section"),
+        "abstract": "div.abstract, section.abstract, div.article-abstract",
+    },
+]
+
+_BY_HOST = {host: e for e in EXTRACTORS for host in e["hosts"]}
+_BY_DOI_PREFIX = {prefix: e for e in EXTRACTORS for prefix in e["doi_prefixes"]}
+
+
+def extractor_for(url: Optional[str]) -> Optional[Dict]:
+    """
+    Registry entry for a page URL or DOI link, or None for unknown hosts.
+    """
+    if not url:
+        return None
+
+    parsed = urlparse(url.strip())
+    host = parsed.netloc.lower()
+
+    if host.endswith("doi.org"):
+        prefix = parsed.path.lstrip("/").split("/")[0]
+        return _BY_DOI_PREFIX.get(prefix)
+
+    return _BY_HOST.get(host)
+
+
+def needs_js(url: Optional[str]) -> bool:
+    """
+    Whether pages for this URL / DOI link need a real browser.
+    """
+    extractor = extractor_for(url)
+    return bool(extractor and extractor["needs_js"])
+
+
+def extract_doi_info(
+    page_source: str,
+    parser: str = PARSER,
+    url: Optional[str] = None,
+) -> Dict[str, Optional[str]]:
+    """
+    Parse abstract and acceptance information out of a DOI landing page.
+
+    Pure function of the HTML (and its final URL, which selects the
+    publisher extractor), shared by the HTTP and browser tiers. `blocked`
+    is set (and nothing else parsed) when the page is a bot-check or
+    access-denied interstitial; `extractor` names the extractor used.
+    """
+
+    result = {
+        "abstract": None,
+        "acceptance_info": None,
+        "blocked": False,
+        "extractor": None,
+    }
+
+    if is_blocked(page_source):
+        result["blocked"] = True
+        return result
+
+    extractor = extractor_for(url)
+    info = None
+
+    extract = None
+
+    if extractor is not None:
+        extract = extractor.get("extract")
+        if extract is not None:
+            info = extract(page_source, parser, extractor.get("regions"))
+        else:
+            info = extract_region(extractor, page_source, parser)
+        result["extractor"] = extractor["name"]
+
+    # An extractor that already is the generic path has nothing to fall
+    # back to; parsing the page again would give the same result
+    if info is None or (not info["abstract"] and extract is not extract_generic):
+        info = extract_generic(page_source, parser)
+        result["extractor"] = "generic"
+
+    acceptance_info = info["acceptance_info"]
+    if acceptance_info:
+        acceptance_info = " ".join(acceptance_info.split())
+
+    result["abstract"] = clean_abstract(info["abstract"])
+    result["acceptance_info"] = acceptance_info
+
+    return result
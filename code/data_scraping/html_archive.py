@@ -0,0 +1,143 @@
+"""
+Compressed, content-addressed archive of fetched DOI landing pages.
+
+Each page is stored once under the SHA-256 of its normalized DOI link,
+as a gzipped JSON record holding the HTML and the final (post-redirect)
+URL:
+
+    <root>/<key[:2]>/<key>.json.gz
+
+reparse_archive() re-runs extraction over every archived page on all
+cores, so extraction rules can be changed without re-scraping.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional
+
+import pandas as pd
+
+from extraction import extract_doi_info
+from parse_abstract import strip_non_abstract_tail
+from parse_acceptance import parse_acceptance_info
+
+
+def normalize_doi_link(raw: str) -> Optional[str]:
+    """
+    Canonical form of a DOI link: first line, no whitespace, lower-case,
+    and reduced to the bare DOI for doi.org links. None for a missing
+    (NaN) or blank link.
+    """
+    if not isinstance(raw, str) or not raw.strip():
+        return None
+
+    link = raw.strip().splitlines()[0].strip()
+    lowered = link.lower()
+
+    for prefix in ("https://doi.org/", "http://doi.org/", "https://dx.doi.org/", "http://dx.doi.org/", "doi:"):
+        if lowered.startswith(prefix):
+            return lowered[len(prefix):]
+
+    return lowered
+
+
+def archive_key(link: str) -> str:
+    return hashlib.sha256(normalize_doi_link(link).encode("utf-8")).hexdigest()
+
+
+class HtmlArchive:
+    """
+    Read/write access to an archive directory. Writes are atomic, so
+    concurrent workers and crashes never leave partial records.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, link: str) -> str:
+        key = archive_key(link)
+        return os.path.join(self.root, key[:2], f"{key}.json.gz")
+
+    def put(self, link: str, html: str, final_url: Optional[str] = None) -> str:
+        """
+        Store (or replace) the page for `link`; returns its path.
+        """
+        path = self.path_for(link)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        record = {
+            "link": link,
+            "doi": normalize_doi_link(link),
+            "final_url": final_url,
+            "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "html": html,
+        }
+
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+        return path
+
+    def get(self, link: str) -> Optional[Dict]:
+        path = self.path_for(link)
+        if not os.path.exists(path):
+            return None
+        return read_record(path)
+
+    def __contains__(self, link: str) -> bool:
+        return os.path.exists(self.path_for(link))
+
+    def paths(self) -> Iterator[str]:
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                if name.endswith(".json.gz"):
+                    yield os.path.join(directory, name)
+
+
+def read_record(path: str) -> Dict:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def reparse_record(path: str) -> Dict[str, Optional[str]]:
+    """
+    Run the full extraction pipeline on one archived page.
+    """
+    record = read_record(path)
+    info = extract_doi_info(record["html"], url=record["final_url"] or record["link"])
+    acceptance = parse_acceptance_info(info["acceptance_info"])
+
+    return {
+        "link": record["link"],
+        "doi": record["doi"],
+        "final_url": record["final_url"],
+        "abstract": info["abstract"],
+        "acceptance_info": info["acceptance_info"],
+        "blocked": info["blocked"],
+        "extractor": info["extractor"],
+        "accepted_by": acceptance["editor"],
+        "department": acceptance["department"],
+        "cleaned_abstracts": strip_non_abstract_tail(info["abstract"]),
+    }
+
+
+def reparse_archive(root: str, workers: Optional[int] = None, chunksize: int = 64) -> pd.DataFrame:
+    """
+    Re-extract every archived page in parallel across processes.
+
+    Returns one row per archived DOI with the same parsed columns that
+    scrape_master_script produces.
+    """
+    paths = sorted(HtmlArchive(root).paths())
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        rows = list(executor.map(reparse_record, paths, chunksize=chunksize))
+
+    return pd.DataFrame(rows)
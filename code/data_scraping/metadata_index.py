@@ -0,0 +1,333 @@
+"""
+Local DOI index built from Crossref / OpenAlex snapshot files.
+
+Reads bulk metadata dumps from local disk (no network access):
+- Crossref public data files: *.json.gz, each {"items": [...]}
+- OpenAlex works snapshot: part_*.gz, one work per line
+
+and stores abstract, title, authors and dates per DOI in SQLite, so
+the scraper only has to visit landing pages for DOIs the snapshot has
+no abstract for.
+"""
+
+import gzip
+import html
+import json
+import os
+import re
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+from html_archive import normalize_doi_link
+
+INSERT_BATCH = 10_000
+
+JATS_TITLE_RE = re.compile(r"<jats:title[^>]*>.*?</jats:title>", re.IGNORECASE | re.DOTALL)
+TAG_RE = re.compile(r"<[^>]+>")
+ACCEPTANCE_NOTE_RE = re.compile(r"This (?:paper|article) was accepted by", re.IGNORECASE)
+ACCEPTANCE_STOP_MARKERS = ("Supplemental Material:", "Electronic Companion:", "Funding:")
+
+COLUMNS = [
+    "doi",
+    "source",
+    "title",
+    "abstract",
+    "authors",
+    "published_online",
+    "published_print",
+    "received",
+    "accepted",
+]
+
+
+# -----------------------------
+# RECORD NORMALIZATION
+# -----------------------------
+def strip_jats(abstract: Optional[str]) -> Optional[str]:
+    """
+    Plain text from a Crossref JATS abstract, without its 'Abstract' title.
+    """
+    if not abstract:
+        return None
+
+    text = JATS_TITLE_RE.sub(" ", abstract)
+    text = TAG_RE.sub(" ", text)
+    text = " ".join(html.unescape(text).split())
+    return text or None
+
+
+def invert_abstract(inverted_index: Optional[Dict[str, List[int]]]) -> Optional[str]:
+    """
+    Rebuild an OpenAlex abstract from its word -> positions index.
+    """
+    if not inverted_index:
+        return None
+
+    positions = [(pos, word) for word, places in inverted_index.items() for pos in places]
+    return " ".join(word for _, word in sorted(positions)) or None
+
+
+def date_from_parts(field: Optional[Dict]) -> Optional[str]:
+    """
+    ISO date (or year / year-month) from a Crossref date-parts field.
+    """
+    if not field:
+        return None
+
+    parts = (field.get("date-parts") or [[None]])[0]
+    if not parts or parts[0] is None:
+        return None
+
+    return "-".join(f"{p:02d}" if i else str(p) for i, p in enumerate(parts))
+
+
+def normalize_crossref(item: Dict) -> Dict:
+    authors = []
+    for author in item.get("author", []):
+        name = " ".join(p for p in (author.get("given"), author.get("family")) if p)
+        authors.append(name or author.get("name"))
+
+    # Some publishers deposit received / accepted dates as assertions
+    assertions = {a.get("name"): a.get("value") for a in item.get("assertion", [])}
+
+    return {
+        "doi": item["DOI"].lower(),
+        "source": "crossref",
+        "title": (item.get("title") or [None])[0],
+        "abstract": strip_jats(item.get("abstract")),
+        "authors": json.dumps([a for a in authors if a]),
+        "published_online": date_from_parts(item.get("published-online")),
+        "published_print": date_from_parts(item.get("published-print")),
+        "received": assertions.get("received"),
+        "accepted": assertions.get("accepted"),
+    }
+
+
+def normalize_openalex(work: Dict) -> Dict:
+    authors = [
+        a["author"].get("display_name")
+        for a in work.get("authorships", [])
+        if a.get("author")
+    ]
+
+    return {
+        "doi": normalize_doi_link(work["doi"]),
+        "source": "openalex",
+        "title": work.get("title") or work.get("display_name"),
+        "abstract": invert_abstract(work.get("abstract_inverted_index")),
+        "authors": json.dumps([a for a in authors if a]),
+        "published_online": work.get("publication_date"),
+        "published_print": None,
+        "received": None,
+        "accepted": None,
+    }
+
+
+def normalize_record(record: Dict) -> Optional[Dict]:
+    """
+    Index row for a Crossref item or OpenAlex work, or None without a DOI.
+    """
+    if record.get("DOI"):
+        return normalize_crossref(record)
+    if record.get("doi"):
+        return normalize_openalex(record)
+    return None
+
+
+# -----------------------------
+# SNAPSHOT READING
+# -----------------------------
+def snapshot_files(path: str) -> List[str]:
+    if os.path.isfile(path):
+        return [path]
+
+    files = []
+    for directory, _, names in os.walk(path):
+        for name in names:
+            if name.endswith((".json", ".jsonl", ".gz")):
+                files.append(os.path.join(directory, name))
+    return sorted(files)
+
+
+def _expand(record: Dict) -> Iterator[Dict]:
+    # Crossref dump files and API responses wrap works in "items"
+    container = record.get("message", record)
+    if isinstance(container, dict) and isinstance(container.get("items"), list):
+        yield from container["items"]
+    else:
+        yield container
+
+
+def iter_snapshot_records(path: str) -> Iterator[Dict]:
+    """
+    Raw records from every snapshot file under `path`, whether a file is
+    one JSON document or JSON Lines, gzipped or not.
+    """
+    for file in snapshot_files(path):
+        opener = gzip.open if file.endswith(".gz") else open
+
+        with opener(file, "rt", encoding="utf-8") as f:
+            first = f.readline()
+            try:
+                record = json.loads(first)
+            except json.JSONDecodeError:
+                # Pretty-printed single document
+                yield from _expand(json.loads(first + f.read()))
+                continue
+
+            yield from _expand(record)
+            for line in f:
+                if line.strip():
+                    yield from _expand(json.loads(line))
+
+
+# -----------------------------
+# INDEX
+# -----------------------------
+def connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS works ("
+        " doi TEXT PRIMARY KEY,"
+        " source TEXT,"
+        " title TEXT,"
+        " abstract TEXT,"
+        " authors TEXT,"
+        " published_online TEXT,"
+        " published_print TEXT,"
+        " received TEXT,"
+        " accepted TEXT)"
+    )
+    # DOIs a snapshot scan looked for, found or not, so DOIs the snapshot
+    # does not have are not searched for again
+    conn.execute("CREATE TABLE IF NOT EXISTS searched (doi TEXT PRIMARY KEY)")
+    return conn
+
+
+# Later snapshots only fill fields the index does not have yet, so a
+# Crossref abstract is not overwritten by an OpenAlex record without one.
+# `source` names where the abstract came from.
+UPSERT_SQL = (
+    f"INSERT INTO works ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))}) "
+    "ON CONFLICT(doi) DO UPDATE SET "
+    "source = CASE WHEN works.abstract IS NULL AND excluded.abstract IS NOT NULL"
+    " THEN excluded.source ELSE works.source END, "
+    + ", ".join(f"{c} = COALESCE(works.{c}, excluded.{c})" for c in COLUMNS[2:])
+)
+
+
+def build_metadata_index(
+    snapshot_path: str,
+    db_path: str,
+    dois: Optional[Iterable[str]] = None,
+) -> int:
+    """
+    Load snapshot records into the SQLite index at db_path.
+
+    Pass `dois` (links or bare DOIs) to keep only the works we need,
+    which keeps the index small when reading a full snapshot. Once the
+    scan finishes they are recorded as searched (see unsearched_dois).
+
+    Returns:
+        int: number of records written.
+    """
+    wanted = {normalize_doi_link(d) for d in dois} - {None} if dois is not None else None
+
+    conn = connect(db_path)
+    batch = []
+    written = 0
+
+    def flush():
+        conn.executemany(UPSERT_SQL, [[row[c] for c in COLUMNS] for row in batch])
+        conn.commit()
+
+    for record in iter_snapshot_records(snapshot_path):
+        row = normalize_record(record)
+        if row is None or (wanted is not None and row["doi"] not in wanted):
+            continue
+
+        batch.append(row)
+        if len(batch) >= INSERT_BATCH:
+            flush()
+            written += len(batch)
+            batch = []
+
+    if batch:
+        flush()
+        written += len(batch)
+
+    if wanted is not None:
+        conn.executemany("INSERT OR IGNORE INTO searched (doi) VALUES (?)", [(d,) for d in wanted])
+        conn.commit()
+
+    conn.close()
+    return written
+
+
+def unsearched_dois(db_path: str, links: Iterable[str]) -> List[str]:
+    """
+    Normalized DOIs of `links` that have no index row and that no earlier
+    snapshot scan looked for, i.e. those worth another scan.
+    """
+    dois = {normalize_doi_link(link) for link in links} - {None}
+    if not os.path.exists(db_path):
+        return sorted(dois)
+
+    conn = connect(db_path)
+    known = {
+        row[0]
+        for table in ("works", "searched")
+        for row in conn.execute(f"SELECT doi FROM {table}")
+    }
+    conn.close()
+
+    return sorted(dois - known)
+
+
+def split_acceptance(abstract: Optional[str]) -> Optional[str]:
+    """
+    The 'This paper was accepted by ...' note INFORMS appends to its
+    deposited abstracts, in the same form as the scraped acceptance_info.
+    """
+    if not isinstance(abstract, str):
+        return None
+
+    match = ACCEPTANCE_NOTE_RE.search(abstract)
+    if not match:
+        return None
+
+    note = abstract[match.start():]
+    for marker in ACCEPTANCE_STOP_MARKERS:
+        idx = note.find(marker)
+        if idx != -1:
+            note = note[:idx]
+
+    return note.strip()[:500]
+
+
+def lookup_dois(db_path: str, links: Iterable[str]) -> pd.DataFrame:
+    """
+    Index rows for the given DOI links, indexed by normalized DOI, with
+    authors as a list and an acceptance_info column split out of the
+    abstract.
+    """
+    dois = sorted({normalize_doi_link(link) for link in links} - {None})
+    conn = connect(db_path)
+
+    frames = []
+    # Stay well below SQLite's bound-parameter limit
+    for i in range(0, len(dois), 500):
+        chunk = dois[i:i + 500]
+        placeholders = ",".join("?" * len(chunk))
+        frames.append(
+            pd.read_sql_query(f"SELECT * FROM works WHERE doi IN ({placeholders})", conn, params=chunk)
+        )
+    conn.close()
+
+    found = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=COLUMNS)
+    found["authors"] = found["authors"].apply(lambda a: json.loads(a) if a else [])
+    found["acceptance_info"] = found["abstract"].apply(split_acceptance)
+
+    return found.set_index("doi")
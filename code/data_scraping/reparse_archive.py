@@ -0,0 +1,33 @@
+"""
+Re-run abstract and acceptance extraction over the local HTML archive
+written by scrape_master_script.py, without touching the network.
+
+Uses every core; change extraction.py, parse_acceptance.py or
+parse_abstract.py and rerun this instead of re-scraping.
+"""
+
+import pandas as pd
+
+from html_archive import normalize_doi_link, reparse_archive
+
+LINKS_CSV = '/Users/austincoffelt/Documents/Who_Writes_What/data/raw/links_to_scrape.csv'
+ARCHIVE_DIR = '/Users/austincoffelt/Documents/Who_Writes_What/data/raw/html_archive'
+OUTPUT_CSV = '/Users/austincoffelt/Documents/Who_Writes_What/data/processed/scraped_results_reparsed.csv'
+
+
+if __name__ == "__main__":
+    df = pd.read_csv(LINKS_CSV)
+    df.drop('Unnamed: 0', axis=1, inplace=True)
+
+    parsed = reparse_archive(ARCHIVE_DIR)
+    print(f"Re-parsed {len(parsed)} archived pages")
+
+    # Match on the normalized DOI so link formatting differences don't matter
+    df["doi"] = df["link"].apply(normalize_doi_link)
+    df_results = df.merge(parsed.drop(columns="link"), on="doi", how="left")
+
+    missing = df_results["final_url"].isna().sum()
+    if missing:
+        print(f"{missing} DOIs are not in the archive")
+
+    df_results.to_csv(OUTPUT_CSV, index=False)
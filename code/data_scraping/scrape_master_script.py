@@ -1,14 +1,63 @@
+import os
+
 import pandas as pd
 from doi_scraper import scrape_multiple_dois
+from html_archive import normalize_doi_link
+from metadata_index import build_metadata_index, lookup_dois, unsearched_dois
 from parse_acceptance import parse_acceptance_info
 from parse_abstract import strip_non_abstract_tail
 
+# Local Crossref / OpenAlex snapshot and the DOI index built from it
+SNAPSHOT_PATH = '/Users/austincoffelt/Documents/Who_Writes_What/data/raw/metadata_snapshot'
+METADATA_DB = '/Users/austincoffelt/Documents/Who_Writes_What/data/processed/metadata_index.db'
+
 # Load your data
 df = pd.read_csv('/Users/austincoffelt/Documents/Who_Writes_What/data/raw/links_to_scrape.csv')
 df.drop('Unnamed: 0', axis=1, inplace=True)
 
-# Scrape all DOIs
-df_results = scrape_multiple_dois(df)
+# Take abstracts from the metadata snapshot where it has them
+df["doi"] = df["link"].apply(normalize_doi_link)
+df["abstract_source"] = None
+df_known = df.iloc[0:0]
+index = None
+
+if os.path.exists(SNAPSHOT_PATH):
+    # Index DOIs added to the links file since the last run. This rescans
+    # the snapshot, so DOIs an earlier scan did not find are skipped
+    missing = unsearched_dois(METADATA_DB, df["doi"])
+    if missing:
+        written = build_metadata_index(SNAPSHOT_PATH, METADATA_DB, dois=missing)
+        print(f"Indexed {written} snapshot records for {len(missing)} new DOIs")
+
+    index = lookup_dois(METADATA_DB, df["doi"])
+    with_abstract = index[index["abstract"].notna()]
+
+    df_known = df[df["doi"].isin(with_abstract.index)].copy()
+    df_known["abstract"] = df_known["doi"].map(with_abstract["abstract"])
+    df_known["acceptance_info"] = df_known["doi"].map(with_abstract["acceptance_info"])
+    df_known["scrape_error"] = None
+    df_known["abstract_source"] = df_known["doi"].map(with_abstract["source"])
+    print(f"{len(df_known)} abstracts from the metadata snapshot, {len(df) - len(df_known)} to scrape")
+
+# Scrape the remaining DOIs, appending each finished DOI to the checkpoint
+# so a rerun after a crash only scrapes what is missing or errored. Raw
+# pages are archived so extraction can be re-run offline (reparse_archive.py)
+df_scraped = scrape_multiple_dois(
+    df[~df.index.isin(df_known.index)],
+    checkpoint_path='/Users/austincoffelt/Documents/Who_Writes_What/data/processed/scrape_checkpoint.jsonl',
+    archive_dir='/Users/austincoffelt/Documents/Who_Writes_What/data/raw/html_archive',
+)
+df_scraped["abstract_source"] = "scrape"
+
+df_results = pd.concat([df_known, df_scraped]).sort_index()
+
+# Title, authors and dates from the index for every DOI it has, including
+# those whose abstract was scraped; values already in the links file win
+if index is not None:
+    index["authors"] = index["authors"].apply(lambda names: "; ".join(names) or None)
+    for col in ["title", "authors", "received", "accepted", "published_online"]:
+        values = df_results["doi"].map(index[col])
+        df_results[col] = df_results[col].fillna(values) if col in df_results.columns else values
 
 # parse acceptance info for person and department
 parsed = df_results["acceptance_info"].apply(parse_acceptance_info)
@@ -19,4 +68,4 @@ df_results["department"] = parsed.apply(lambda x: x["department"])
 df_results['cleaned_abstracts'] = df_results['abstract'].apply(strip_non_abstract_tail)
 
 # Save results
-df_results.to_csv('/Users/austincoffelt/Documents/Who_Writes_What/data/processed/scraped_results1.csv', index=False)
\ No newline at end of file
+df_results.to_csv('/Users/austincoffelt/Documents/Who_Writes_What/data/processed/scraped_results1.csv', index=False)
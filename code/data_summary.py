@@ -1,9 +1,14 @@
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
-df = pd.read_csv('~/tonal_analysis/data/processed/llm_evaluated/clean_evaluations/merged_evaluations.csv')
-df.drop(columns=["Unnamed: 0"], inplace=True)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'gender_guess'))
+from gender_guess_helper.authorship import authorship_indicators
+from merged_data import load_merged_evaluations
+
+# typed load: Int8 scores, categorical Journal / Sex / Department
+df = load_merged_evaluations()
 
 # ── Setup ────────────────────────────────────────────────────────────────────
 TONAL_COLS = [
@@ -24,6 +29,9 @@ def save(df, filename):
     df.to_csv(path)
     print(f"  Saved → {path}")
 
+# ── Article-level gender composition (one grouped pass) ─────────────────────
+articles = authorship_indicators(df, article_col='ArticleID', sex_col='Sex', level='article')
+
 # ── 1. Article-level tonal feature summary ───────────────────────────────────
 article_tonal = df.groupby('ArticleID')[TONAL_COLS].mean()
 summary = article_tonal.agg(['mean', 'std']).T
@@ -47,10 +55,7 @@ sex_counts['Pct'] = (sex_counts['Count'] / sex_counts['Count'].sum() * 100).roun
 save(sex_counts, 'table3_author_sex_counts.csv')
 
 # ── 4. Articles: >50% female vs ≤50% female authorship ──────────────────────
-art_female = (df.groupby('ArticleID')['over_half_female']
-                .first()
-                .reset_index())
-female_split = art_female['over_half_female'].value_counts().reset_index()
+female_split = articles['over_half_female'].value_counts().reset_index()
 female_split.columns = ['Over Half Female', 'Article Count']
 female_split['Pct'] = (female_split['Article Count'] / female_split['Article Count'].sum() * 100).round(1)
 save(female_split, 'table4_female_majority_articles.csv')
@@ -64,18 +69,17 @@ dept_counts = (df.groupby('Department')['Title']
 save(dept_counts, 'table5_articles_by_department.csv')
 
 # ── 6. Tonal features by female authorship majority (article level) ──────────
-art_tonal = df.groupby('ArticleID')[TONAL_COLS + ['over_half_female']].mean()
+art_tonal = article_tonal.join(articles['over_half_female'])
 majority_tonal = art_tonal.groupby('over_half_female')[TONAL_COLS].mean().T.round(3)
 majority_tonal.index.name = 'Feature'
 save(majority_tonal, 'table6_tonal_by_female_majority.csv')
 
 # ── 7. Solo vs. co-authored counts & tonal comparison ───────────────────────
-art_solo = df.groupby('ArticleID')['Solo_authored_paper'].first().reset_index()
-solo_counts = art_solo['Solo_authored_paper'].value_counts().reset_index()
+solo_counts = articles['Solo_authored_paper'].value_counts().reset_index()
 solo_counts.columns = ['Solo Authored', 'Article Count']
 save(solo_counts, 'table7a_solo_vs_coauthored_counts.csv')
 
-art_tonal2 = df.groupby('ArticleID')[TONAL_COLS + ['Solo_authored_paper']].mean()
+art_tonal2 = article_tonal.join(articles['Solo_authored_paper'])
 solo_tonal = art_tonal2.groupby('Solo_authored_paper')[TONAL_COLS].mean().T.round(3)
 solo_tonal.columns = ['Co-authored', 'Solo']
 solo_tonal.index.name = 'Feature'
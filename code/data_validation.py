@@ -1,11 +1,17 @@
-import pandas as pd
+import sys
 import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'gender_guess'))
+from gender_guess_helper.authorship import authorship_indicators
+from merged_data import load_merged_evaluations
 
 # ───────────────────────────────────────────────────────────────
 # LOAD DATA
 # ───────────────────────────────────────────────────────────────
 
-df = pd.read_csv('~/tonal_analysis/data/processed/llm_evaluated/clean_evaluations/merged_evaluations.csv')
+# raises if required columns are missing or scores are not whole numbers
+df = load_merged_evaluations()
 
 print("\nLoaded dataset:")
 print(f"Rows: {df.shape[0]:,}")
@@ -89,26 +95,24 @@ print("\n⚠ Confirm these ranges match your rubric scale.")
 
 print("\n── LOGICAL CONSISTENCY CHECKS ──")
 
+# Indicators recomputed from the author rows, compared with the stored flags
+if AUTHOR_ID_COL != "" and SEX_COL in df.columns:
+    recomputed = authorship_indicators(df, article_col=ARTICLE_ID_COL, sex_col=SEX_COL, level="article")
+else:
+    recomputed = None
+
 # 4A. Solo-authored consistency
-if AUTHOR_ID_COL != "" and SOLO_AUTHORED_COL in df.columns:
-    author_counts = df.groupby([ARTICLE_ID_COL, ABSTRACT_COL])[AUTHOR_ID_COL].nunique()
-    solo_flag = df.groupby([ARTICLE_ID_COL, ABSTRACT_COL])[SOLO_AUTHORED_COL].first()
-    inconsistent_solo = ((author_counts == 1) != solo_flag).sum()
+if recomputed is not None and SOLO_AUTHORED_COL in df.columns:
+    solo_flag = df.groupby(ARTICLE_ID_COL)[SOLO_AUTHORED_COL].first()
+    inconsistent_solo = (recomputed["Solo_authored_paper"] != solo_flag).sum()
     print(f"Inconsistent solo-authored flags: {inconsistent_solo}")
 else:
     print("Skipping solo-authored consistency check.")
 
 # 4B. Over-half-female consistency
-if AUTHOR_ID_COL != "" and SEX_COL in df.columns:
-    temp = df.copy()
-    temp[SEX_COL] = temp[SEX_COL].str.lower().str.strip()
-    female_share = (
-        temp.assign(is_female=(temp[SEX_COL] == "female"))
-            .groupby(ARTICLE_ID_COL)['is_female']
-            .mean()
-    )
+if recomputed is not None and OVER_HALF_FEMALE_COL in df.columns:
     majority_flag = df.groupby(ARTICLE_ID_COL)[OVER_HALF_FEMALE_COL].first()
-    inconsistent_majority = ((female_share >= 0.5) != majority_flag).sum()
+    inconsistent_majority = (recomputed["over_half_female"] != majority_flag).sum()
     print(f"Inconsistent female-majority flags: {inconsistent_majority}")
 else:
     print("Skipping female-majority consistency check.")
@@ -1,64 +1,25 @@
+import sys
 import pandas as pd
-import numpy as np
+from pathlib import Path
+from gender_guess_helper.authorship import INDICATOR_COLS, authorship_indicators
 
-df = pd.read_csv('~/tonal_analysis/data/processed/llm_evaluated/clean_evaluations/hengel_QJE_gender.csv')
-# ------------------------------------------------------------------
-# PAPER-LEVEL COUNTS
-# ------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from analysis_store import STORE_DB, store_articles
 
-# total authors per paper
-paper_author_counts = df.groupby("ArticleID").size()
+INPUT_CSV = '~/tonal_analysis/data/processed/llm_evaluated/clean_evaluations/hengel_QJE_gender.csv'
+OUTPUT_CSV = '~/tonal_analysis/data/processed/llm_evaluated/clean_evaluations/hengel_QJE_gender_index.csv'
 
-# female authors per paper
-female_author_counts = (
-    df["Sex"]
-    .eq("Female")
-    .groupby(df["ArticleID"])
-    .sum()
-)
+# Set to the guessed-sex probability column (e.g. 'gender_prob_namsor') to
+# also get the probability-weighted Expected_female_ratio
+PROB_COL = None
 
-# ------------------------------------------------------------------
-# FEMALE AUTHORSHIP RATIO
-# ------------------------------------------------------------------
+df = pd.read_csv(INPUT_CSV)
 
-df["Female_authorship_ratio"] = (
-    df["ArticleID"].map(female_author_counts)
-    / df["ArticleID"].map(paper_author_counts)
-)
+# paper-level authorship indicators, broadcast to every author row
+df = authorship_indicators(df, article_col="ArticleID", sex_col="Sex", prob_col=PROB_COL)
 
-# ------------------------------------------------------------------
-# SOLO-AUTHORED PAPERS
-# ------------------------------------------------------------------
+# one copy per article in the analysis store
+indicator_cols = INDICATOR_COLS + (["Expected_female_ratio"] if PROB_COL else [])
+store_articles(df, indicator_cols, db_path=STORE_DB)
 
-df["Solo_authored_paper"] = (
-    df["ArticleID"].map(paper_author_counts) == 1
-).astype(int)
-
-# ------------------------------------------------------------------
-# FEMALE AUTHORSHIP (CONTINUOUS, ≥ 50% ONLY)
-# ------------------------------------------------------------------
-
-df["Female_authorship"] = np.where(
-    df["Female_authorship_ratio"] >= 0.5,
-    df["Female_authorship_ratio"],
-    0.0
-)
-
-# ------------------------------------------------------------------
-# BINARY INDICATORS
-# ------------------------------------------------------------------
-
-df["over_half_female"] = (
-    df["Female_authorship_ratio"] >= 0.5
-).astype(int)
-
-df["at_least_one_female"] = (
-    df["Female_authorship_ratio"] > 0
-).astype(int)
-
-df["Single_gender_paper"] = (
-    (df["Female_authorship_ratio"] == 0) |
-    (df["Female_authorship_ratio"] == 1)
-).astype(int)
-
-df.to_csv("~/tonal_analysis/data/processed/llm_evaluated/clean_evaluations/hengel_QJE_gender_index.csv")
\ No newline at end of file
+df.to_csv(OUTPUT_CSV)
@@ -1,42 +1,128 @@
 import pandas as pd
-from gender_guesser import namsor_gender_full_batch
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from gender_guesser import URL, make_session, namsor_gender_full_batch
+from gender_cache import GenderCache
+from name_normalization import build_name_groups
 
-def add_gender_namsor_fullname(df, name_col):
+BATCH_SIZE = 100
+
+
+def lookup_names(names, cache=None, max_workers=4, url=URL):
+    """
+    Resolve unique names to (gender, probability), taking cached names
+    from `cache` and sending the rest to NamSor in concurrent 100-name
+    batches. Each batch's results are written to the cache as soon as it
+    returns; names NamSor gave no gender for are not cached, so they are
+    asked again next time. If a batch fails, every other batch is still
+    cached before the first error is re-raised.
+    """
+    gender_map = cache.get_many(names) if cache is not None else {}
+    missing = [name for name in names if name not in gender_map]
+
+    print(f"{len(gender_map)} names cached, {len(missing)} to look up")
+
+    if missing:
+        batches = [missing[i:i + BATCH_SIZE] for i in range(0, len(missing), BATCH_SIZE)]
+        session = make_session(pool_size=max_workers)
+
+        def run(batch_names):
+            return namsor_gender_full_batch(batch_names, session=session, url=url)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(run, batch) for batch in batches]
+
+            # Cache each batch as it finishes, so a failing batch does not
+            # lose results that were already paid for
+            error = None
+            for future in as_completed(futures):
+                try:
+                    payload_names, results = future.result()
+                except Exception as e:
+                    print(f"NamSor batch failed: {e}")
+                    error = error or e
+                    continue
+
+                fetched = {
+                    entry["name"]: results[entry["id"]]
+                    for entry in payload_names
+                    if entry["id"] in results
+                }
+                if cache is not None:
+                    cache.put_many({name: r for name, r in fetched.items() if r[0] is not None})
+                gender_map.update(fetched)
+
+            if error is not None:
+                raise error
+
+    return gender_map
+
+
+def add_gender_namsor_fullname(df, name_col, cache_path=None, max_workers=4, url=URL, local_model=None):
+    """
+    Add gender_namsor / gender_prob_namsor columns for the names in
+    name_col, plus gender_source ('local' or 'namsor').
+
+    With a LocalGenderModel, names whose first name it resolves above its
+    confidence threshold never reach the API.
+    """
     df = df.copy()
 
     df["gender_namsor"] = None
     df["gender_prob_namsor"] = None
+    df["gender_source"] = None
 
-    # deduplicate full names
-    unique_names = (
-        df[name_col]
-        .dropna()
-        .astype(str)
-        .str.strip()
-        .loc[lambda x: x != ""]
-        .unique()
-        .tolist()
-    )
+    names = df[name_col].where(df[name_col].notna()).astype("string").str.strip()
+
+    # deduplicate full names, then collapse spelling / ordering variants
+    # ("J. Smith", "SMITH, John") onto one representative lookup
+    present = names.dropna().loc[lambda x: x != ""]
+    unique_names = present.unique().tolist()
+    representative = build_name_groups(present.tolist())
+    lookups = sorted(set(representative.values()))
+
+    print(f"{len(unique_names)} distinct names -> {len(lookups)} lookups after normalization")
 
-    gender_map = {}
+    rep_map = {}
+    source = {}
+    if local_model is not None:
+        for rep in lookups:
+            gender, prob = local_model.predict(rep)
+            if gender is not None:
+                rep_map[rep] = (gender, prob)
+                source[rep] = "local"
 
-    for i in range(0, len(unique_names), 100):
-        batch_names = unique_names[i:i + 100]
-        payload_names, results = namsor_gender_full_batch(batch_names)
+        print(f"{len(rep_map)} names resolved by the local model")
+        lookups = [rep for rep in lookups if rep not in rep_map]
 
-        for entry in payload_names:
-            gender, prob = results.get(entry["id"], (None, None))
-            gender_map[entry["name"]] = (gender, prob)
+    cache = GenderCache(cache_path) if cache_path else None
+    try:
+        remote = lookup_names(lookups, cache=cache, max_workers=max_workers, url=url)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    rep_map.update(remote)
+    source.update({rep: "namsor" for rep in remote})
+
+    gender_map = {
+        name: rep_map.get(rep, (None, None))
+        for name, rep in representative.items()
+    }
 
     # map back to full dataframe
-    df["gender_namsor"] = df[name_col].map(
+    df["gender_namsor"] = names.map(
         lambda x: gender_map.get(x, (None, None))[0]
         if pd.notna(x) else None
     )
 
-    df["gender_prob_namsor"] = df[name_col].map(
+    df["gender_prob_namsor"] = names.map(
         lambda x: gender_map.get(x, (None, None))[1]
         if pd.notna(x) else None
     )
 
-    return df
\ No newline at end of file
+    df["gender_source"] = names.map(
+        lambda x: source.get(representative.get(x))
+        if pd.notna(x) else None
+    )
+
+    return df
@@ -0,0 +1,64 @@
+import os
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+from name_normalization import split_authors
+
+
+def explode_authors(df, article_col="ArticleID", authors_col="authors"):
+    """
+    Split each article's author list into a narrow author table, leaving
+    the article attributes (abstract, scores, ...) in a table of their own
+    instead of repeating them on every author row.
+
+    Returns:
+        (authors, articles):
+            authors: article_col, author_name (category), position (int16,
+                0 for the first listed author); articles without any
+                author get no rows.
+            articles: df with a total_authors column, one row per article.
+    """
+    names = df[authors_col].map(split_authors)
+    lengths = names.str.len().to_numpy()
+    # position within each article: running index minus the article's start
+    starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+    authors = pd.DataFrame({
+        article_col: np.repeat(df[article_col].to_numpy(), lengths),
+        "author_name": pd.Categorical(list(chain.from_iterable(names))),
+        "position": (np.arange(lengths.sum()) - starts).astype("int16"),
+    })
+
+    articles = df.assign(total_authors=lengths.astype("int16"))
+
+    return authors, articles
+
+
+def write_author_tables(authors, articles, authors_path, articles_path):
+    """
+    Write both tables as Parquet (requires pyarrow), which keeps the
+    categorical and integer dtypes for the next step.
+    """
+    authors.to_parquet(os.path.expanduser(authors_path), index=False)
+    articles.to_parquet(os.path.expanduser(articles_path), index=False)
+
+
+def read_authors(path):
+    return pd.read_parquet(os.path.expanduser(path))
+
+
+def join_articles(authors, articles_path, columns=None, article_col="ArticleID"):
+    """
+    Author rows with the article attributes attached, reading only
+    `columns` (all by default) from the article table. Adds the
+    paper_author_id key (ArticleID_position).
+    """
+    if columns is not None:
+        columns = [article_col] + [c for c in columns if c != article_col]
+    articles = pd.read_parquet(os.path.expanduser(articles_path), columns=columns)
+
+    out = authors.merge(articles, on=article_col, how="left", validate="many_to_one")
+    out["paper_author_id"] = out[article_col].astype(str) + "_" + out["position"].astype(str)
+
+    return out
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+INDICATOR_COLS = [
+    "Female_authorship_ratio",
+    "Solo_authored_paper",
+    "Female_authorship",
+    "over_half_female",
+    "at_least_one_female",
+    "Single_gender_paper",
+]
+
+
+def _indicators(n_authors, n_female):
+    ratio = n_female / n_authors
+
+    return pd.DataFrame({
+        "Female_authorship_ratio": ratio,
+        "Solo_authored_paper": (n_authors == 1).astype(int),
+        # continuous female authorship, counted only at >= 50%
+        "Female_authorship": np.where(ratio >= 0.5, ratio, 0.0),
+        "over_half_female": (ratio >= 0.5).astype(int),
+        "at_least_one_female": (ratio > 0).astype(int),
+        "Single_gender_paper": ((ratio == 0) | (ratio == 1)).astype(int),
+    }, index=n_authors.index)
+
+
+def authorship_indicators(df, article_col="ArticleID", sex_col="Sex", prob_col=None, level="author"):
+    """
+    Paper-level gender composition indicators from an author-level frame
+    (one row per author and article).
+
+    All counts come from a single grouped pass over the articles:
+    Female_authorship_ratio (female authors / authors), Solo_authored_paper,
+    Female_authorship (the ratio when >= 0.5, else 0), over_half_female,
+    at_least_one_female and Single_gender_paper.
+
+    With prob_col (e.g. 'Sex_probability' / 'gender_prob_namsor', the
+    probability of the guessed sex), Expected_female_ratio is the mean
+    probability that each author is female; authors without a
+    probability count as 0 or 1 from sex_col.
+
+    Args:
+        level: 'author' returns df with the indicators broadcast to every
+            author row; 'article' returns one row per article, indexed by
+            article_col, with n_authors and n_female.
+    """
+    if level not in ("author", "article"):
+        raise ValueError(f"level must be 'author' or 'article', got {level!r}")
+
+    sex = df[sex_col].astype("string").str.strip().str.lower()
+    is_female = sex.eq("female").fillna(False).astype(bool)
+
+    counts = pd.DataFrame({
+        "n_authors": 1,
+        "n_female": is_female.astype(int),
+    }, index=df.index)
+
+    if prob_col is not None:
+        prob = pd.to_numeric(df[prob_col], errors="coerce")
+        counts["expected_female"] = (
+            prob.where(is_female, 1 - prob)
+            .where(sex.notna())
+            .fillna(counts["n_female"])
+            .astype(float)
+        )
+
+    grouped = counts.groupby(df[article_col])
+
+    if level == "article":
+        totals = grouped.sum()
+        totals.index.name = article_col
+    else:
+        totals = grouped.transform("sum")
+
+    out = _indicators(totals["n_authors"], totals["n_female"])
+    if prob_col is not None:
+        out["Expected_female_ratio"] = totals["expected_female"] / totals["n_authors"]
+
+    if level == "article":
+        return pd.concat([totals[["n_authors", "n_female"]], out], axis=1)
+
+    return df.assign(**{col: out[col] for col in out.columns})
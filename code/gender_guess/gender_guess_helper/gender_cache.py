@@ -0,0 +1,54 @@
+import os
+import sqlite3
+
+
+class GenderCache:
+    """
+    On-disk SQLite store of name -> (gender, probability) lookups, so
+    each name is only ever sent to the API once.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.expanduser(path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS genders ("
+            " name TEXT PRIMARY KEY,"
+            " gender TEXT,"
+            " probability REAL,"
+            " created_at TEXT DEFAULT CURRENT_TIMESTAMP)"
+        )
+        self.conn.commit()
+
+    def get_many(self, names):
+        """
+        Return {name: (gender, probability)} for every cached name.
+        """
+        found = {}
+        names = list(set(names))
+
+        # Stay well below SQLite's bound-parameter limit
+        for i in range(0, len(names), 500):
+            chunk = names[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT name, gender, probability FROM genders WHERE name IN ({placeholders})",
+                chunk,
+            )
+            for name, gender, probability in rows:
+                found[name] = (gender, probability)
+
+        return found
+
+    def put_many(self, items):
+        """
+        Store {name: (gender, probability)}, replacing earlier lookups.
+        """
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO genders (name, gender, probability) VALUES (?, ?, ?)",
+            [(name, gender, prob) for name, (gender, prob) in items.items()],
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
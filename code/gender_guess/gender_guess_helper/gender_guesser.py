@@ -3,12 +3,15 @@ import requests
 import uuid
 import os
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 load_dotenv()
 
 API_KEY = os.getenv("NAMSOR_API_KEY")
 
-URL = "https://v2.namsor.com/NamSorAPIv2/api2/json/genderFullBatch"
+# Override with NAMSOR_URL, e.g. to point at a local mock server
+URL = os.getenv("NAMSOR_URL", "https://v2.namsor.com/NamSorAPIv2/api2/json/genderFullBatch")
 
 HEADERS = {
     "X-API-KEY": API_KEY,
@@ -16,7 +19,33 @@ HEADERS = {
     "Content-Type": "application/json"
 }
 
-def namsor_gender_full_batch(names):
+MAX_RETRIES = 5
+BACKOFF_FACTOR = 1.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def make_session(pool_size=8):
+    """
+    Keep-alive session that retries 429 and 5xx responses with
+    exponential backoff, honouring Retry-After.
+    """
+    retry = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"POST"}),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def namsor_gender_full_batch(names, session=None, url=URL):
 
     payload = {
         "personalNames": [
@@ -29,7 +58,10 @@ def namsor_gender_full_batch(names):
         ]
     }
 
-    response = requests.post(URL, json=payload, headers=HEADERS, timeout=30)
+    if session is None:
+        response = requests.post(url, json=payload, headers=HEADERS, timeout=30)
+    else:
+        response = session.post(url, json=payload, timeout=30)
     response.raise_for_status()
 
     results = {}
@@ -39,4 +71,4 @@ def namsor_gender_full_batch(names):
             entry.get("probabilityCalibrated")
         )
 
-    return payload["personalNames"], results
\ No newline at end of file
+    return payload["personalNames"], results
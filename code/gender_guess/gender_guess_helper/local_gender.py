@@ -0,0 +1,108 @@
+import os
+
+import pandas as pd
+from name_normalization import fold, is_initial, parse_name
+
+MIN_COUNT = 5
+THRESHOLD = 0.9
+
+
+def first_name(raw):
+    """
+    Folded first spelled-out given name ("A. Abigail Payne" -> "abigail"),
+    or None if the name only has initials.
+    """
+    given, _ = parse_name(raw)
+    for token in given:
+        if not is_initial(token):
+            return fold(token)
+    return None
+
+
+def load_name_list(path):
+    """
+    Read an open first-name list with name, sex and count columns, with
+    or without a header (e.g. the SSA yobYYYY.txt files). Sex may be
+    F/M or female/male.
+
+    Returns:
+        DataFrame: first_name, female, male counts.
+    """
+    df = pd.read_csv(path, header=None, names=["name", "sex", "count"])
+    if not str(df.iloc[0]["count"]).strip().isdigit():
+        df = df.iloc[1:]
+
+    df["count"] = pd.to_numeric(df["count"], errors="coerce").fillna(0)
+    df["first_name"] = df["name"].astype(str).map(fold)
+    sex = df["sex"].astype(str).str.strip().str[0].str.upper()
+
+    return (
+        df.assign(female=df["count"].where(sex == "F", 0), male=df["count"].where(sex == "M", 0))
+        .groupby("first_name")[["female", "male"]]
+        .sum()
+        .reset_index()
+    )
+
+
+def build_first_name_table(labeled, name_col="AuthorName", sex_col="Sex", name_lists=()):
+    """
+    First-name -> female probability table from hand-labeled authors
+    (e.g. Hengel's Author.csv), optionally pooled with open name lists.
+
+    Returns:
+        DataFrame: first_name, female, male, n, p_female (Laplace-smoothed).
+    """
+    sex = labeled[sex_col].astype(str).str.strip().str.lower()
+    counts = pd.DataFrame({
+        "first_name": labeled[name_col].map(first_name),
+        "female": (sex == "female").astype(int),
+        "male": (sex == "male").astype(int),
+    }).dropna(subset=["first_name"])
+
+    frames = [counts] + [load_name_list(path) for path in name_lists]
+    table = pd.concat(frames).groupby("first_name")[["female", "male"]].sum()
+
+    table["n"] = table["female"] + table["male"]
+    table = table[table["n"] > 0]
+    table["p_female"] = (table["female"] + 1) / (table["n"] + 2)
+
+    return table.reset_index()
+
+
+class LocalGenderModel:
+    """
+    Dictionary lookup of first-name gender probabilities. Only names seen
+    at least `min_count` times whose majority gender reaches `threshold`
+    are resolved; everything else is left for the API.
+    """
+
+    def __init__(self, table, threshold=THRESHOLD, min_count=MIN_COUNT):
+        self.threshold = threshold
+        self.min_count = min_count
+        self.table = {
+            row.first_name: (row.p_female, row.n)
+            for row in table.itertuples(index=False)
+        }
+
+    @classmethod
+    def from_csv(cls, path, **kwargs):
+        return cls(pd.read_csv(os.path.expanduser(path), keep_default_na=False), **kwargs)
+
+    def predict(self, name):
+        """
+        (gender, probability) for a full name, or (None, None) if the
+        first name is unknown, rare or ambiguous.
+        """
+        key = first_name(name)
+        if key is None or key not in self.table:
+            return None, None
+
+        p_female, n = self.table[key]
+        if n < self.min_count:
+            return None, None
+
+        gender, prob = ("female", p_female) if p_female >= 0.5 else ("male", 1 - p_female)
+        if prob < self.threshold:
+            return None, None
+
+        return gender, prob
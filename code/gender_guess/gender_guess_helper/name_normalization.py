@@ -0,0 +1,154 @@
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+SUFFIXES = {"jr", "sr", "ii", "iii", "iv"}
+PARTICLES = {"van", "von", "de", "der", "den", "del", "della", "di", "da", "du", "la", "le", "dos", "das", "bin", "al"}
+
+_PUNCT = re.compile(r"[^\w\s'-]")
+_AND = re.compile(r"\s+(?:and|&)\s+")
+
+
+def fold(text):
+    """
+    Lower-case, accent-free form of a string ("José" -> "jose").
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def parse_name(raw):
+    """
+    Split a raw author name into (given-name tokens, surname), undoing
+    "Last, First" ordering and dropping suffixes like Jr. or III.
+    Tokens keep their original spelling and case.
+    """
+    if not isinstance(raw, str) or not raw.strip():
+        return [], ""
+
+    name = raw.strip()
+    if name.count(",") == 1:
+        last, first = [p.strip() for p in name.split(",")]
+        if fold(first).strip(". ") in SUFFIXES:
+            name = last
+        elif last and first:
+            name = f"{first} {last}"
+
+    tokens = [t for t in _PUNCT.sub(" ", name.replace(".", ". ")).split() if t]
+    tokens = [t for t in tokens if fold(t) not in SUFFIXES]
+
+    if not tokens:
+        return [], ""
+    if len(tokens) == 1:
+        return [], tokens[0]
+
+    # Keep particles with the surname ("Ludwig van Beethoven")
+    i = len(tokens) - 1
+    while i > 1 and fold(tokens[i - 1]) in PARTICLES:
+        i -= 1
+
+    return tokens[:i], " ".join(tokens[i:])
+
+
+def is_initial(token):
+    return len(fold(token).strip("-'")) == 1
+
+
+def canonical_key(raw):
+    """
+    Case-, accent- and order-insensitive key for a name: folded given
+    names and surname, e.g. "SMITH, John" and "John  Smith" -> "john smith".
+    """
+    given, surname = parse_name(raw)
+    return " ".join(fold(t) for t in given + [surname] if t)
+
+
+def block_key(raw):
+    """
+    Blocking key (folded surname, first initial) shared by every variant
+    of a name, including initial-only forms like "J. Smith".
+    """
+    given, surname = parse_name(raw)
+    initial = fold(given[0])[0] if given else ""
+    return fold(surname), initial
+
+
+def first_last(raw):
+    """
+    A raw name written first-name first, otherwise as spelled: "Smith,
+    John A." -> "John A. Smith". Accents, hyphens and periods are kept.
+    """
+    name = raw.strip()
+    if name.count(",") == 1:
+        last, first = [p.strip() for p in name.split(",")]
+        if last and first and fold(first).strip(". ") not in SUFFIXES:
+            return f"{first} {last}"
+    return name
+
+
+def build_name_groups(names):
+    """
+    Map every raw name to the single representative name that should be
+    looked up for it.
+
+    Names are grouped by canonical key. Within a (surname, first initial)
+    block, initial-only variants ("J. Smith") join the fully spelled
+    variant when exactly one exists ("John Smith"); with several ("John",
+    "James") they stay on their own. The representative is the group's
+    most frequent original spelling (pass every occurrence in `names`,
+    not just distinct names), written first-name first as the gender API
+    expects.
+
+    Returns:
+        dict: raw name -> representative name.
+    """
+    counts = Counter(names)
+    by_key = defaultdict(list)
+    for raw in counts:
+        key = canonical_key(raw)
+        if key:
+            by_key[key].append(raw)
+
+    blocks = defaultdict(list)
+    for key, raws in by_key.items():
+        blocks[block_key(raws[0])].append(key)
+
+    representative = {}
+
+    for keys in blocks.values():
+        parsed = {key: parse_name(by_key[key][0]) for key in keys}
+        full = [k for k in keys if parsed[k][0] and not is_initial(parsed[k][0][0])]
+
+        for key in keys:
+            given, surname = parsed[key]
+            target = key
+            if (not given or is_initial(given[0])) and len(full) == 1:
+                target = full[0]
+            representative[key] = first_last(max(by_key[target], key=counts.__getitem__))
+
+    return {raw: representative[key] for key, raws in by_key.items() for raw in raws}
+
+
+def split_authors(raw):
+    """
+    Split an author-list string into individual names.
+
+    Authors are separated by ';' when present, otherwise by ',' (and a
+    standalone 'and' / '&'). Comma lists that alternate one-word surnames
+    with given names ("Smith, John, Doe, Jane") are read as "Last, First"
+    pairs instead of being split at every comma.
+    """
+    if not isinstance(raw, str):
+        return []
+
+    sep = ";" if ";" in raw else ","
+    parts = [p.strip() for p in _AND.sub(sep, raw).split(sep) if p.strip()]
+
+    if (
+        sep == ","
+        and len(parts) % 2 == 0
+        and all(len(parts[i].split()) == 1 for i in range(0, len(parts), 2))
+    ):
+        return [f"{parts[i + 1]} {parts[i]}" for i in range(0, len(parts), 2)]
+
+    return parts
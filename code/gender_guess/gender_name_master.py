@@ -1,9 +1,37 @@
+import os
+
 import pandas as pd
 from gender_guess_helper.apply_guesses import add_gender_namsor_fullname
+from gender_guess_helper.author_tables import join_articles, read_authors
+from gender_guess_helper.local_gender import LocalGenderModel, build_first_name_table
+
+# names already looked up are served from here instead of the API
+NAMSOR_CACHE = '~/Documents/Who_Writes_What/data/processed/namsor_cache.db'
+
+# first-name table built from Hengel's hand-labeled authors; names it is
+# confident about skip the API. Add open name lists (name,sex,count) to
+# NAME_LISTS to widen its coverage
+HENGEL_AUTHORS = '~/Documents/Who_Writes_What/data/raw/hengel_replication_data/Author.csv'
+FIRST_NAME_TABLE = '~/Documents/Who_Writes_What/data/processed/first_name_gender.csv'
+NAME_LISTS = []
+LOCAL_THRESHOLD = 0.9
+
+if not os.path.exists(os.path.expanduser(FIRST_NAME_TABLE)):
+    table = build_first_name_table(pd.read_csv(HENGEL_AUTHORS), name_lists=NAME_LISTS)
+    table.to_csv(FIRST_NAME_TABLE, index=False)
+
+local_model = LocalGenderModel.from_csv(FIRST_NAME_TABLE, threshold=LOCAL_THRESHOLD)
+
+# narrow author table written by data_cleaning.py; article attributes
+# are only joined back for the output
+AUTHORS = '~/Documents/Who_Writes_What/data/processed/author_level.parquet'
+ARTICLES = '~/Documents/Who_Writes_What/data/processed/article_level.parquet'
 
 # read in data
-authors = pd.read_csv('~/Documents/Who_Writes_What/data/processed/author_level.csv')
+authors = read_authors(AUTHORS)
+
+authors = add_gender_namsor_fullname(authors, "author_name", cache_path=NAMSOR_CACHE, local_model=local_model)
 
-df = add_gender_namsor_fullname(authors, "author_name")
+df = join_articles(authors, ARTICLES)
 
 df.to_csv('~/Documents/Who_Writes_What/data/processed/llm_evaluated/clean_evaluations/full_results_clean_gender_guess.csv', index=False)
\ No newline at end of file
@@ -1,20 +1,41 @@
 import pandas as pd
+from analysis_store import (
+    CRITERIA, HENGEL_COLUMNS, STORE_DB, author_keys, store_articles, store_authorship, store_evaluations, store_gender_guesses,
+)
 
 # read in data
 hengel = pd.read_csv('~/tonal_analysis/data/processed/llm_evaluated/clean_evaluations/Hengel_evaluations.csv')
 scraped = pd.read_csv('~/tonal_analysis/data/processed/llm_evaluated/clean_evaluations/ready_results.csv')
 
 # preparing hengel data for merging
-hengel.rename(columns={'PubDate':'Publsh_date', 'Title_PBLSH':'Title', 'Abstract_PBLSH':'Abstract', 'evaluation_pblsh_parsed':'Evaluation', 'AuthorName':'Author_name', 'NativeLanguage':'Native_language'}, inplace=True)
+hengel.rename(columns=HENGEL_COLUMNS, inplace=True)
+# store key from the Hengel AuthorID, which is dropped below
+hengel['author_key'] = author_keys(hengel, id_col='AuthorID')
+hengel['gender_source'] = 'hengel'
 hengel.drop(columns=['Unnamed: 0', 'NberID', 'WPDate', 'Title_NBER', 'Abstract_NBER', 'Note_NBER', 'Note_PBLSH', 'Volume', 'Issue', 'Part', 'FirstPage', 'LastPage', 'evaluation_nber_parsed', 'AuthorID'], inplace=True)
 
 # preparing scraped data for merging
 scraped.rename(columns={'title':'Title', 'metrics':'Metrics', 'received':'Received', 'accepted':'Accepted', 'published_online':'Publsh_date', 'accepted_by':'Accepted_by', 'department':'Department', 'evaluations':'Evaluation', 'author_name':'Author_name', 'gender_namsor':'Sex', 'gender_prob_namsor':'Sex_probability'}, inplace=True)
+# author position from paper_author_id (ArticleID_position) for the store key
+scraped['position'] = scraped['paper_author_id'].str.rsplit('_', n=1).str[1].astype(int)
 scraped.drop(columns=['Unnamed: 0', 'link', 'authors', 'under_review', 'pub_year', 'pub_month', 'paper_author_id', 'total_authors'], inplace=True)
 scraped['Journal'] = 'MgSc'
+# same offset as DATASET_ID_OFFSETS in LLM_evaluations/helper_scripts/evaluation_store.py
 scraped['ArticleID'] += 15000
+scraped['author_key'] = author_keys(scraped, id_col=None)
+scraped.drop(columns=['position'], inplace=True)
 
 # merging dataframe
 merged_df = pd.concat([hengel, scraped])
 merged_df.drop_duplicates(subset=['ArticleID', 'Author_name', 'Abstract'], keep='last', inplace=True)
-merged_df.to_csv('~/tonal_analysis/data/processed/llm_evaluated/clean_evaluations/merged_evaluations.csv')
\ No newline at end of file
+
+# analysis store: articles, authors and their links, gender guesses, scores
+AUTHOR_COLS = ['author_key', 'Author_name', 'Native_language', 'Sex', 'Sex_probability', 'gender_source']
+article_cols = [c for c in merged_df.columns if c not in AUTHOR_COLS and c not in CRITERIA]
+
+store_articles(merged_df, article_cols, db_path=STORE_DB)
+store_authorship(merged_df, author_columns=['Author_name', 'Native_language'], db_path=STORE_DB)
+store_gender_guesses(merged_df, db_path=STORE_DB)
+store_evaluations(merged_df, CRITERIA, db_path=STORE_DB)
+
+merged_df.drop(columns=['author_key']).to_csv('~/tonal_analysis/data/processed/llm_evaluated/clean_evaluations/merged_evaluations.csv')
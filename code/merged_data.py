@@ -0,0 +1,164 @@
+"""
+Typed loader for merged_evaluations.csv.
+
+The column types are declared once here: rubric scores are Int8,
+Journal / Sex / Department (and the other low-cardinality labels) are
+categorical and the date columns are datetimes. The first load parses the
+CSV and writes a Parquet copy (requires pyarrow) next to it, keyed by the
+CSV's size and modification time; later loads read only the requested
+columns from that copy until the CSV changes.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from analysis_store import CRITERIA
+
+MERGED_CSV = '~/tonal_analysis/data/processed/llm_evaluated/clean_evaluations/merged_evaluations.csv'
+CACHE_DIR = '.cache'
+
+CATEGORY_COLS = ['Journal', 'Sex', 'Department', 'Native_language', 'Language', 'gender_source']
+DATE_COLS = ['Publsh_date', 'Received', 'Accepted']
+FLAG_COLS = ['Solo_authored_paper', 'over_half_female', 'at_least_one_female', 'Single_gender_paper']
+FLOAT_COLS = ['Female_authorship_ratio', 'Female_authorship', 'Sex_probability']
+
+# Columns every merged file must have
+REQUIRED_COLS = ['ArticleID', 'Journal', 'Title', 'Abstract'] + CRITERIA
+
+SCHEMA = {
+    'ArticleID': 'int32',
+    **{c: 'Int8' for c in CRITERIA},
+    **{c: 'category' for c in CATEGORY_COLS},
+    **{c: 'datetime64[ns]' for c in DATE_COLS},
+    **{c: 'Int8' for c in FLAG_COLS},
+    **{c: 'float64' for c in FLOAT_COLS},
+}
+
+
+def _coerce_numeric(series: pd.Series, dtype: str) -> pd.Series:
+    values = pd.to_numeric(series, errors='coerce')
+
+    bad = values.isna() & series.notna()
+    if bad.any():
+        print(f"  {series.name}: {bad.sum()} non-numeric values set to missing")
+
+    if dtype == 'Int8':
+        present = values.dropna()
+        if ((present % 1) != 0).any() or (present.abs() > 127).any():
+            raise ValueError(f"{series.name}: expected whole numbers between -128 and 127")
+        return values.astype('Int8')
+
+    return values.astype(dtype)
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast the declared columns present in df to their schema types.
+
+    Raises:
+        ValueError: if ArticleID is missing for some rows or a score /
+            flag column holds non-integer values.
+    """
+    df = df.copy()
+
+    for col, dtype in SCHEMA.items():
+        if col not in df.columns:
+            continue
+
+        if col == 'ArticleID':
+            if df[col].isna().any():
+                raise ValueError(f"{df[col].isna().sum()} rows without an ArticleID")
+            df[col] = df[col].astype(dtype)
+        elif dtype == 'category':
+            df[col] = df[col].astype('category')
+        elif col in DATE_COLS:
+            dates = pd.to_datetime(df[col], errors='coerce', format='ISO8601')
+            bad = dates.isna() & df[col].notna()
+            if bad.any():
+                print(f"  {col}: {bad.sum()} unparseable dates set to missing")
+            df[col] = dates
+        else:
+            df[col] = _coerce_numeric(df[col], dtype)
+
+    return df
+
+
+def check_columns(header: Iterable[str], columns: Optional[Iterable[str]] = None) -> None:
+    """
+    Raise ValueError when required (or explicitly requested) columns are
+    missing from the file, e.g. after a rename upstream.
+    """
+    header = set(header)
+    wanted = set(REQUIRED_COLS) | set(columns or [])
+    missing = sorted(wanted - header)
+    if missing:
+        raise ValueError(f"merged evaluations file is missing columns: {missing}")
+
+
+def _read_csv(path: Path, columns: Optional[list] = None) -> pd.DataFrame:
+    header = pd.read_csv(path, nrows=0).columns
+    check_columns(header, columns)
+
+    usecols = columns if columns is not None else [c for c in header if not c.startswith('Unnamed')]
+    dtype = {c: 'category' for c in CATEGORY_COLS if c in usecols}
+    # Scores and dates are parsed in apply_schema so malformed cells are
+    # reported instead of failing the whole read
+    dtype.update({c: 'string' for c in CRITERIA + FLAG_COLS + DATE_COLS if c in usecols})
+
+    df = pd.read_csv(path, usecols=usecols, dtype=dtype)
+    return apply_schema(df)[usecols]
+
+
+def cache_path(path: Path) -> Path:
+    """
+    Parquet copy of `path` for its current size and modification time
+    (and the current schema).
+    """
+    stat = path.stat()
+    key = f"{stat.st_size}-{stat.st_mtime_ns}-{sorted(SCHEMA.items())}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return path.parent / CACHE_DIR / f"{path.stem}.{digest}.parquet"
+
+
+def load_merged_evaluations(
+    columns: Optional[Iterable[str]] = None,
+    path: str = MERGED_CSV,
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    """
+    Load merged_evaluations.csv with the declared column types.
+
+    Args:
+        columns: columns to return (all by default). ArticleID is always
+            included.
+        use_cache: read from / write the Parquet copy. Without it only
+            `columns` are parsed from the CSV.
+    """
+    path = Path(os.path.expanduser(path))
+    if columns is not None:
+        columns = ['ArticleID'] + [c for c in columns if c != 'ArticleID']
+
+    if not use_cache:
+        return _read_csv(path, columns)
+
+    cached = cache_path(path)
+    if not cached.exists():
+        df = _read_csv(path)
+        cached.parent.mkdir(exist_ok=True)
+        # Drop copies of older versions of the file
+        for old in cached.parent.glob(f"{path.stem}.*.parquet"):
+            old.unlink()
+        tmp = cached.with_suffix('.tmp')
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, cached)
+        return df if columns is None else df[columns]
+
+    if columns is not None:
+        import pyarrow.parquet as pq
+
+        check_columns(pq.read_schema(cached).names, columns)
+    return pd.read_parquet(cached, columns=columns)
@@ -1,10 +1,29 @@
+import sys
 import pandas as pd
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from analysis_store import HENGEL_COLUMNS, STORE_DB, author_keys, store_articles, store_authorship, store_gender_guesses
 
 articles = pd.read_csv('~/tonal_analysis/data/processed/llm_evaluated/clean_evaluations/hengel_QJE.csv')
 authors = pd.read_csv('~/tonal_analysis/data/raw/hengel_replication_data/Author.csv')
 author_corr = pd.read_csv('~/tonal_analysis/data/raw/hengel_replication_data/AuthorCorr.csv')
 
+# article attributes go to the analysis store (under the merged file's
+# column names) before the author merge repeats them on every author row
+store = articles.rename(columns=HENGEL_COLUMNS)
+store_articles(store, [c for c in store.columns if c != 'Unnamed: 0'], db_path=STORE_DB)
+
+author_columns = [HENGEL_COLUMNS.get(c, c) for c in authors.columns if c != 'Sex']
+
 authors = pd.merge(authors, author_corr, on='AuthorID')
 articles = pd.merge(articles, authors, on='ArticleID')
 
-articles.to_csv('~/tonal_analysis/data/processed/llm_evaluated/clean_evaluations/hengel_QJE_gender.csv')
\ No newline at end of file
+# authors, author-article links and the hand-labeled Sex
+store = articles.rename(columns=HENGEL_COLUMNS)
+store['author_key'] = author_keys(store, id_col='AuthorID')
+store['gender_source'] = 'hengel'
+store_authorship(store, author_columns=author_columns, db_path=STORE_DB)
+store_gender_guesses(store, prob_col=None, db_path=STORE_DB)
+
+articles.to_csv('~/tonal_analysis/data/processed/llm_evaluated/clean_evaluations/hengel_QJE_gender.csv')